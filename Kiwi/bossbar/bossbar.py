@@ -38,20 +38,19 @@ default_criteria = 'dummy'
 class Bossbar(LangApi.abstract.Variable):
     isNative = True
 
-    _general: Bossbar = None
-
     @classmethod
-    @property
-    def general(cls) -> Bossbar:  # noqa
-        api = LangApi.api.API.general
-        if cls._general is None:
+    def general(cls, api: LangApi.api.API) -> Bossbar:
+        """
+        Returns the default bossbar of the compilation.
+        """
+        if cls not in api.defaults:
             api.enableGlobal()
-            cls._general = Bossbar(api).InitsType(
+            api.defaults[cls] = Bossbar(api).InitsType(
                 api.prefix.default_bossbar,
                 api.prefix.default_bossbar
             )
             api.disableGlobal()
-        return cls._general
+        return api.defaults[cls]
 
     def InitsType(self, attr: Attr, address: Attr, *args) -> Bossbar:
         assert not args
@@ -3,13 +3,13 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import TYPE_CHECKING, Any, Callable, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Set
 
 # Custom libraries
 # ----------------
 
 import LangApi
-from components.kiwiScope import Attr
+from components.kiwiScope import Attr, CodeScope
 import components.kiwiASO as kiwi
 from components.kiwiTools import dumpAST
 
@@ -37,9 +37,11 @@ class ForClassic(LangApi.abstract.Block):
     attr: Attr
     for_attr: Attr
     predicate_attr: Attr
+    condition: List[LangApi.bytecode.CodeType]
     check_var: Optional[Kiwi.scoreboard.score.Score]
 
     body_local: int
+    body_scopes: Set[CodeScope]
 
     def Formalize(self,
                   initialize: kiwi.statement,
@@ -60,11 +62,13 @@ class ForClassic(LangApi.abstract.Block):
         # --------------
 
         self.name = self.for_attr.toName()
+        scopes = set(self.api.code)
         self.api.enterCodeScope(self, codeKey='main')
         self.body_local = self.analyzer.scope.useLocalSpace(hideMode=True)
         body = self.analyzer.visit(body)
         self.analyzer.scope.leaveSpace()
         self.api.leaveScopeWithKey()
+        self.body_scopes = self.api.code - scopes - {self}
 
         return LangApi.abstract.Construct(
             LangApi.abstract.ConstructMethod.Reference,
@@ -84,64 +88,72 @@ class ForClassic(LangApi.abstract.Block):
         condition_buffer = self.api.bufferPop()
         assert isinstance(predicate, LangApi.abstract.TransPredicate)
 
-        self.api.enterCodeScope(self, codeKey='predicate')
-        self.api.system(
-            LangApi.bytecode.RawJSON(
-                predicate.transPredicate()
-            )
-        )
-        self.api.leaveScopeWithKey()
-
-        self.api.visit(
-            initialize
-        )
+        # Constant folding
+        # ----------------
 
-        self.api.system(
-            LangApi.bytecode.Execute(
-                [
+        constant = LangApi.bytecode.evaluate_predicate(predicate.transPredicate())
+        if constant is False:
+            self.api.visit(
+                initialize
+            )
+            self.api.code.discard(self)
+            self.api.code.difference_update(self.body_scopes)
+            return
+
+        self.condition = list()
+        if constant is None:
+            self.condition = self.api.getConditionSteps(predicate.transPredicate())
+            if self.condition is None:
+                self.api.enterCodeScope(self, codeKey='predicate')
+                self.api.system(
+                    LangApi.bytecode.RawJSON(
+                        predicate.transPredicate()
+                    )
+                )
+                self.api.leaveScopeWithKey()
+                self.condition = [
                     LangApi.bytecode.StepIfPredicate(
                         self.api.prefix.FileAttrToDirectory(
                             self.predicate_attr
                         )
-                    ),
-                    LangApi.bytecode.StepRun(
-                        LangApi.bytecode.FunctionDirectCall(
-                            self.api.prefix.FileAttrToDirectory(
-                                self.for_attr
-                            )
-                        )
                     )
                 ]
-            )
+
+        self.api.visit(
+            initialize
         )
 
+        self.api.system(self._getCall(constant))
+
         self.name = self.for_attr.toName()
         self.api.enterCodeScope(self, codeKey='main')
         self.analyzer.scope.useLocalSpace(self.body_local, hideMode=True)
         self.api.visit(body)
         self.api.visit(increment)
         self.api.bufferPaste(condition_buffer)
-        self.api.system(
-            LangApi.bytecode.Execute(
-                [
-                    LangApi.bytecode.StepIfPredicate(
-                        self.api.prefix.FileAttrToDirectory(
-                            self.predicate_attr
-                        )
-                    ),
-                    LangApi.bytecode.StepRun(
-                        LangApi.bytecode.FunctionDirectCall(
-                            self.api.prefix.FileAttrToDirectory(
-                                self.for_attr
-                            )
-                        )
-                    )
-                ]
-            )
-        )
+        self.api.system(self._getCall(constant))
         self.analyzer.scope.leaveSpace()
         self.api.leaveScopeWithKey()
 
+    def _getCall(self, constant: Optional[bool]) -> LangApi.bytecode.CodeType:
+        """
+        Returns the command, which calls the next iteration.
+        The predicate is not checked, if it's constantly true.
+        """
+        call = LangApi.bytecode.FunctionDirectCall(
+            self.api.prefix.FileAttrToDirectory(
+                self.for_attr
+            )
+        )
+        if constant:
+            return call
+        return LangApi.bytecode.Execute(
+            [
+                *self.condition,
+                LangApi.bytecode.StepRun(call)
+            ]
+        )
+
     def toPath(self, key: str) -> List[str]:
         match key:
             case 'main':
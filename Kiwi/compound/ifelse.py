@@ -3,13 +3,13 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import TYPE_CHECKING, Any, Callable, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Set
 
 # Custom libraries
 # ----------------
 
 import LangApi
-from components.kiwiScope import Attr
+from components.kiwiScope import Attr, CodeScope
 import components.kiwiASO as kiwi
 
 
@@ -37,10 +37,13 @@ class If(LangApi.abstract.Block):
     if_attr: Attr
     else_attr: Attr
     predicate_attr: Attr
+    condition: List[LangApi.bytecode.CodeType]
     check_var: Optional[Kiwi.scoreboard.score.Score]
 
     then_local: int
     or_else_local: int
+    then_scopes: Set[CodeScope]
+    or_else_scopes: Set[CodeScope]
 
     def Formalize(self,
                   condition: kiwi.expression,
@@ -59,18 +62,22 @@ class If(LangApi.abstract.Block):
         # --------------
 
         self.name = self.if_attr.toName()
+        scopes = set(self.api.code)
         self.api.enterCodeScope(self, codeKey='if')
         self.then_local = self.analyzer.scope.useLocalSpace(hideMode=True)
         then = self.analyzer.visit(then)
         self.analyzer.scope.leaveSpace()
         self.api.leaveScopeWithKey()
+        self.then_scopes = self.api.code - scopes - {self}
 
         self.name = self.else_attr.toName()
+        scopes = set(self.api.code)
         self.api.enterCodeScope(self, codeKey='else')
         self.or_else_local = self.analyzer.scope.useLocalSpace(hideMode=True)
         or_else = self.analyzer.visit(or_else)
         self.analyzer.scope.leaveSpace()
         self.api.leaveScopeWithKey()
+        self.or_else_scopes = self.api.code - scopes - {self}
 
         return LangApi.abstract.Construct(
             LangApi.abstract.ConstructMethod.Reference,
@@ -87,28 +94,46 @@ class If(LangApi.abstract.Block):
             condition)
         assert isinstance(predicate, LangApi.abstract.TransPredicate)
 
+        # Constant folding
+        # ----------------
+
+        match LangApi.bytecode.evaluate_predicate(predicate.transPredicate()):
+            case True:
+                self.inlineBranch(self.if_attr, 'if', self.then_local, then)
+                self.dropBranch('else', self.or_else_scopes)
+                return
+            case False:
+                self.inlineBranch(self.else_attr, 'else', self.or_else_local, or_else)
+                self.dropBranch('if', self.then_scopes)
+                return
+
         if len(or_else) != 0:
             check_name = self.api.prefix.VarCheck()
             self.check_var = Kiwi.scoreboard.score.Score(self.api).InitsType(
                 check_name, check_name
             ).Assign(Kiwi.tokens.number.IntegerFormat(self.api).Formalize(1))
 
-        self.api.enterCodeScope(self, codeKey='predicate')
-        self.api.system(
-            LangApi.bytecode.RawJSON(
-                predicate.transPredicate()
+        self.condition = self.api.getConditionSteps(predicate.transPredicate())
+        if self.condition is None:
+            self.api.enterCodeScope(self, codeKey='predicate')
+            self.api.system(
+                LangApi.bytecode.RawJSON(
+                    predicate.transPredicate()
+                )
             )
-        )
-        self.api.leaveScopeWithKey()
+            self.api.leaveScopeWithKey()
+            self.condition = [
+                LangApi.bytecode.StepIfPredicate(
+                    self.api.prefix.FileAttrToDirectory(
+                        self.predicate_attr
+                    )
+                )
+            ]
 
         self.api.system(
             LangApi.bytecode.Execute(
                 [
-                    LangApi.bytecode.StepIfPredicate(
-                        self.api.prefix.FileAttrToDirectory(
-                            self.predicate_attr
-                        )
-                    ),
+                    *self.condition,
                     LangApi.bytecode.StepRun(
                         LangApi.bytecode.FunctionDirectCall(
                             self.api.prefix.FileAttrToDirectory(
@@ -156,6 +181,27 @@ class If(LangApi.abstract.Block):
                 )
             )
 
+    def inlineBranch(self, attr: Attr, codeKey: str, local: int,
+                     body: List[LangApi.abstract.Construct]):
+        """
+        Visits the branch, which is always taken, and moves its code into the current scope.
+        """
+        self.name = attr.toName()
+        self.api.enterCodeScope(self, codeKey=codeKey)
+        self.analyzer.scope.useLocalSpace(local, hideMode=True)
+        self.api.visit(body)
+        self.analyzer.scope.leaveSpace()
+        self.api.leaveScopeWithKey()
+        for command in self.code.pop(codeKey, list()):
+            self.api.system(command)
+
+    def dropBranch(self, codeKey: str, scopes: Set[CodeScope]):
+        """
+        Removes the branch, which is never taken, with all its nested scopes.
+        """
+        self.code.pop(codeKey, None)
+        self.api.code.difference_update(scopes)
+
     def toPath(self, key: str) -> List[str]:
         match key:
             case 'if':
@@ -34,6 +34,7 @@ class Module(LangApi.abstract.Block):
     name = None
 
     def Formalize(self, body: List[Any]):
+        self.name = self.api.moduleName
         self.api.enterCodeScope(self)
         result = self.analyzer.visit(body)
         self.api.leaveScope()
@@ -51,9 +52,15 @@ class Module(LangApi.abstract.Block):
 
     def toPath(self, key: str) -> List[str]:
         match key:
+            case 'main' if self.name is None:
+                return [
+                    *self.constructor.attributes.functions,
+                    '--main--.mcfunction'
+                ]
             case 'main':
                 return [
                     *self.constructor.attributes.functions,
+                    self.name,
                     '--main--.mcfunction'
                 ]
         assert False
@@ -3,7 +3,7 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import TYPE_CHECKING, Any, Optional, Callable, Dict, Type
+from typing import TYPE_CHECKING, Any, Optional, Callable, Type
 
 # Custom libraries
 # ----------------
@@ -118,7 +118,7 @@ class Score(LangApi.abstract.Variable,
     def InitsType(self, attr: Attr, address: Attr,
                   scoreboard: Kiwi.scoreboard.scoreboard.Scoreboard = None) -> Score:
         if scoreboard is None:
-            scoreboard = Kiwi.scoreboard.scoreboard.Scoreboard.general
+            scoreboard = Kiwi.scoreboard.scoreboard.Scoreboard.general(self.api)
         assert isinstance(scoreboard, Kiwi.scoreboard.scoreboard.Scoreboard)
         self.attr = attr
         self.address = address
@@ -147,11 +147,9 @@ class Score(LangApi.abstract.Variable,
     # Math methods
     # ------------
 
-    _constants: Dict[int, Score] = dict()
-
     def getConst(self, value: int) -> Score:
-        if value in self._constants.keys():
-            return self._constants[value]
+        if value in self.api.constants.keys():
+            return self.api.constants[value]
         self.api.enableGlobal()
         const_name = self.api.prefix.SpecConst(value)
         result = Score(self.api).InitsType(
@@ -160,7 +158,7 @@ class Score(LangApi.abstract.Variable,
             Kiwi.tokens.number.IntegerFormat(self.api).Formalize(value)
         )
         self.api.disableGlobal()
-        self._constants[value] = result
+        self.api.constants[value] = result
         return result
 
     def Plus(self) -> Score:
@@ -276,7 +274,7 @@ class Score(LangApi.abstract.Variable,
             temp_name = self.api.prefix.SpecTemp()
             temp = Score(self.api).InitsType(
                 temp_name, temp_name
-            ).Assign(self).IDiv(other)
+            ).Assign(self).IMod(other)
             return temp
         assert False
 
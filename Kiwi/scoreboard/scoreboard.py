@@ -46,17 +46,17 @@ class Scoreboard(LangApi.abstract.Variable):
     Criteria from minecraft scoreboards.
     """
 
-    _general: Scoreboard = None
     @classmethod
-    @property
-    def general(cls) -> Scoreboard:  # noqa
-        api = LangApi.api.API.general
-        if cls._general is None:
+    def general(cls, api: LangApi.api.API) -> Scoreboard:
+        """
+        Returns the default scoreboard of the compilation.
+        """
+        if cls not in api.defaults:
             api.enableGlobal()
-            cls._general = Scoreboard(api).InitsType(api.prefix.default_scoreboard,
-                                                                   api.prefix.default_scoreboard)
+            api.defaults[cls] = Scoreboard(api).InitsType(api.prefix.default_scoreboard,
+                                                          api.prefix.default_scoreboard)
             api.disableGlobal()
-        return cls._general
+        return api.defaults[cls]
 
     def InitsType(self, attr: Attr, address: Attr,
                   criteria: kiwi.AST | str = default_criteria) -> Scoreboard:
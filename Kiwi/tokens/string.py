@@ -68,6 +68,12 @@ class StringFormat(LangApi.abstract.Format,
         return self
 
     def PrintSource(self) -> LangApi.bytecode.NBTLiteral:
+        # All placeholders are parsed at once, then they are evaluated in order
+        expressions = iter(self.api.parseExpressions([
+            expression
+            for value, isFormatted in self.values if isFormatted
+            for _, expression, _, _ in self._formatter.parse(value) if expression is not None
+        ]))
         print_result = list()
         for value, isFormatted in self.values:
             if isFormatted:
@@ -81,7 +87,9 @@ class StringFormat(LangApi.abstract.Format,
                             ).PrintSource()
                         )
                     if expression is not None:
-                        evaluated: LangApi.abstract.Printable = self.api.eval(expression)
+                        evaluated: LangApi.abstract.Printable = self.api.visit(
+                            self.api.analyzer.visit(next(expressions))
+                        )
                         result.append(evaluated.PrintSource())
                 print_result.append(result)
             else:
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 from typing import Optional, Any, TYPE_CHECKING, Callable as _Callable, Type, Dict, List  # noqa: F401
 from abc import ABC, abstractmethod
-from inspect import isclass
+from inspect import isclass, getattr_static
 from enum import Enum, auto
 from dataclasses import dataclass, field
 
@@ -125,6 +125,38 @@ class Construct:
     """
 
 
+_methodNames: Dict[ConstructMethod, str] = {
+    ConstructMethod.InitsType: 'InitsType',
+    ConstructMethod.Formalize: 'Formalize',
+
+    ConstructMethod.AddOperation: 'Add',
+    ConstructMethod.SubOperation: 'Sub',
+    ConstructMethod.MulOperation: 'Mul',
+    ConstructMethod.DivOperation: 'Div',
+    ConstructMethod.ModOperation: 'Mod',
+    ConstructMethod.PlusOperation: 'Plus',
+    ConstructMethod.MinusOperation: 'Minus',
+
+    ConstructMethod.AugAddOperation: 'IAdd',
+    ConstructMethod.AugSubOperation: 'ISub',
+    ConstructMethod.AugMulOperation: 'IMul',
+    ConstructMethod.AugDivOperation: 'IDiv',
+    ConstructMethod.AugModOperation: 'IMod',
+
+    ConstructMethod.AssignOperation: 'Assign',
+
+    ConstructMethod.Return: 'Return',
+    ConstructMethod.Call: 'Call',
+    ConstructMethod.Reference: 'Reference',
+    ConstructMethod.Annotation: 'Annotation',
+    ConstructMethod.AnnAssign: 'AnnAssign',
+    ConstructMethod.GetChild: 'GetChild',
+}
+"""
+Names of methods, which are launched by Construct.
+"""
+
+
 class Abstract(ABC):
     constructor: _Constructor
     analyzer: _Analyzer
@@ -145,38 +177,22 @@ class Abstract(ABC):
                 self.associations[key] = value(self.api)
         self.__class__._was_associated = True
 
+    _loaders: Dict[ConstructMethod, Any] = dict()
+    """
+    Dispatch table of the class, it maps construct methods to methods of the class.
+    It's built once at class creation.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._loaders = dict()
+        for command, name in _methodNames.items():
+            if (method := getattr_static(cls, name, None)) is not None:
+                cls._loaders[command] = method
+
     def loader(self, command: ConstructMethod) -> _Callable:
-        cases = {
-            ConstructMethod.InitsType: 'InitsType',
-            ConstructMethod.Formalize: 'Formalize',
-
-            ConstructMethod.AddOperation: 'Add',
-            ConstructMethod.SubOperation: 'Sub',
-            ConstructMethod.MulOperation: 'Mul',
-            ConstructMethod.DivOperation: 'Div',
-            ConstructMethod.ModOperation: 'Mod',
-            ConstructMethod.PlusOperation: 'Plus',
-            ConstructMethod.MinusOperation: 'Minus',
-
-            ConstructMethod.AugAddOperation: 'IAdd',
-            ConstructMethod.AugSubOperation: 'ISub',
-            ConstructMethod.AugMulOperation: 'IMul',
-            ConstructMethod.AugDivOperation: 'IDiv',
-            ConstructMethod.AugModOperation: 'IMod',
-
-            ConstructMethod.AssignOperation: 'Assign',
-
-            ConstructMethod.Return: 'Return',
-            ConstructMethod.Call: 'Call',
-            ConstructMethod.Reference: 'Reference',
-            ConstructMethod.Annotation: 'Annotation',
-            ConstructMethod.AnnAssign: 'AnnAssign',
-            ConstructMethod.GetChild: 'GetChild',
-        }
-        assert command in cases.keys()
-        method = cases.get(command)
-        assert method in dir(self)
-        return self.__getattribute__(method)
+        assert command in self._loaders, f'{self.__class__.__name__} does not support {command}'
+        return self._loaders[command].__get__(self, self.__class__)
 
     associations: Dict[str, Abstract] = dict()
     """
@@ -11,9 +11,9 @@ from __future__ import annotations
 # -----------------
 
 from typing import (
-    Dict, TYPE_CHECKING, Any,List, Type, Set
+    Dict, TYPE_CHECKING, Any,List, Type, Set, Optional, Generator
 )
-from itertools import chain
+from types import GeneratorType
 from inspect import isclass
 
 # Custom libraries
@@ -21,7 +21,8 @@ from inspect import isclass
 
 from components.kiwiScope import BasicScope, CodeScope, Attr as _Attr
 from components.kiwiASO import AST as _AST
-from components.kiwiTools import AST_Visitor as _AST_Visitor
+from components.kiwiTools import AST_Visitor as _AST_Visitor, flattenTuple, runSteps
+from components.kiwiCache import encodeTree, decodeTree
 
 if TYPE_CHECKING:
     import compiler
@@ -50,7 +51,6 @@ class API:
         'builtins': dict()
     }
     prefix: LangApi.prefix.Prefix
-    general: API
 
     # Parts of compiler
     # -----------------
@@ -65,13 +65,18 @@ class API:
     # ------------------
 
     configGeneral: compiler.ConfigGeneral
+    moduleName: Optional[str]
+    """
+    Name of imported module, it's None for the entry module.
+    """
 
     def __init__(
             self,
             constructor: compiler.KiwiConstructor.Constructor,
             builder: compiler.Builder,
             tokenizer: compiler.Tokenizer,
-            ast: compiler.AST
+            ast: compiler.AST,
+            moduleName: str = None
     ):
         # Parts of compiler
         # -----------------
@@ -85,23 +90,28 @@ class API:
         # ------------------
 
         self.configGeneral = builder.configGeneral
+        self.moduleName = moduleName
+
+        # Compilation state
+        # -----------------
+
+        self.code = set()
+        self.scopeFolder = list()
+        self._codeKeys = list()
+        self._codeBuffers = list()
+        self._isGlobal = 0
+        self.constants = dict()
+        self.defaults = dict()
+        self.expressions = dict()
 
         # Initialization
         # --------------
 
-        API.general = self
         self.prefix = LangApi.prefix.Prefix(self)
         for name, value in self.builtinLibScope['builtins'].items():
             self.analyzer.scope.write(
                 name, value
             )
-        del (self.builtinLibScope['builtins'])
-
-    def _unpackTuple(self, value: tuple) -> tuple:
-        try:
-            return self._unpackTuple(tuple(chain.from_iterable(value)))
-        except TypeError:
-            return value
 
     def visit(self, instruction: Any, canInit=False) -> Any:
         """
@@ -109,50 +119,90 @@ class API:
         Also, if the input value is a list with tuple, tuples will be unpacked.
         e.g:
         If the input value is a list of Construct, constructs will be launched.
+        Nested lists, nodes and constructs are visited using explicit stack,
+        so deep trees don't reach recursion limit.
         """
+        return runSteps(self._visitStep, (instruction, canInit))
+
+    def _visitStep(self, task: tuple[Any, bool]) -> Any:
+        instruction, canInit = task
         if isinstance(instruction, _Attr):
             return instruction
         if isinstance(instruction, list):
-            result = list()
-            for item in instruction:
-                visited = self.visit(item)
-                if isinstance(visited, tuple):
-                    result.extend(self._unpackTuple(visited))
-                    continue
-                result.append(visited)
-            return result
+            return self._visitList(instruction)
         if isinstance(instruction, _AST):
-            for annotation, attribute in _AST_Visitor.getAttributes(instruction):
-                visited = self.visit(attribute)
-                instruction.__setattr__(annotation, visited)
-            return instruction
+            return self._visitAttributes(instruction)
         if isinstance(instruction, LangApi.abstract.Construct):
-            parent = self.visit(instruction.parent, canInit=True)
-            assert isinstance(parent, LangApi.abstract.Abstract)
-            if instruction.raw_args:
-                args = instruction.arguments
-            else:
-                args = self.visit(instruction.arguments)
-            return parent.loader(instruction.method)(*args)
+            return self._visitConstruct(instruction)
         if isclass(instruction) and not isinstance(instruction, BasicScope) and canInit:
             instruction: Any
             return instruction(self)
         return instruction
 
-    code: Set[CodeScope] = set()
+    def _visitList(self, instruction: list) -> Generator[Any, Any, list]:
+        result = list()
+        for item in instruction:
+            visited = self._visitStep((item, False))
+            if isinstance(visited, GeneratorType):
+                visited = yield visited
+            if isinstance(visited, tuple) and not isinstance(visited, _Attr):
+                result.extend(flattenTuple(visited))
+                continue
+            result.append(visited)
+        return result
+
+    def _visitAttributes(self, instruction: _AST) -> Generator[Any, Any, _AST]:
+        for annotation, attribute in _AST_Visitor.getAttributes(instruction):
+            visited = self._visitStep((attribute, False))
+            if isinstance(visited, GeneratorType):
+                visited = yield visited
+            instruction.__setattr__(annotation, visited)
+        return instruction
+
+    @staticmethod
+    def _visitConstruct(instruction: LangApi.abstract.Construct) -> Generator[Any, Any, Any]:
+        parent = yield instruction.parent, True
+        assert isinstance(parent, LangApi.abstract.Abstract)
+        if instruction.raw_args:
+            args = instruction.arguments
+        else:
+            args = yield instruction.arguments, False
+        return parent.loader(instruction.method)(*args)
+
+    # Compilation state
+    # -----------------
+    # It's kept by API instance, so every compilation has its own state.
+
+    code: Set[CodeScope]
     """
     A set of all code scopes, that will be put into datapack.
     """
 
-    scopeFolder: List[BasicScope | CodeScope] = list()
+    scopeFolder: List[BasicScope | CodeScope]
     """
     A list of scopes, it's usually used to build prefixes in variable or file names.
     """
 
+    constants: Dict[int, Kiwi.scoreboard.score.Score]
+    """
+    Scores of constant values, which are used by arithmetic operations.
+    """
+
+    defaults: Dict[Type[LangApi.abstract.Abstract], LangApi.abstract.Abstract]
+    """
+    Default objects of built-in types, for example default scoreboard.
+    """
+
+    expressions: Dict[str, bytes]
+    """
+    Parsed expressions of eval, they are kept in binary form (see kiwiCache.encodeTree),
+    because the analyzer changes nodes, so every eval gets its own copy.
+    """
+
     # Another methods
     # ---------------
 
-    _isGlobal: int = 0
+    _isGlobal: int
 
     def enableGlobal(self):
         self._isGlobal += True
@@ -179,7 +229,7 @@ class API:
         """
         self.scopeFolder.append(scope)
 
-    _codeKeys: List[str] = list()
+    _codeKeys: List[str]
 
     def enterCodeScope(self, scope: CodeScope, codeKey: str = None):
         """
@@ -209,7 +259,7 @@ class API:
         self.leaveScope()
         self._codeKeys.pop(-1)
 
-    _codeBuffers: List[Dict[str, List[LangApi.bytecode.CodeType]]] = list()
+    _codeBuffers: List[Dict[str, List[LangApi.bytecode.CodeType]]]
 
     def bufferPush(self):
         """
@@ -268,15 +318,55 @@ class API:
             self.scopeFolder[index].code[codeKey] = list()
         self.scopeFolder[index].code[codeKey].append(command)
 
+    def getConditionSteps(self, predicate: LangApi.bytecode.NBTLiteral) -> Optional[List[LangApi.bytecode.CodeType]]:
+        """
+        This method returns execute steps, which check the predicate natively, without predicate file.
+        If it's not possible, or this optimization is disabled, None is returned.
+        """
+        if not self.configGeneral['score_conditions']:
+            return None
+        return LangApi.bytecode.predicate_to_steps(predicate)
+
     def eval(self, text: str) -> Any:
         """
         This method is used to evaluate a string.
         :return:
         It returns frontend-Object, Score for example
         """
-        result = self.analyzer.ast.eval(compiler.Tokenizer(text).lexer)
+        result = self.parseExpressions([text])[0]
         return self.visit(self.analyzer.visit(result))
 
+    def parseExpressions(self, texts: List[str]) -> List[Any]:
+        """
+        This method is used to parse expressions of eval.
+        Every expression is parsed once per module, new expressions are parsed together by one parser.
+        Only parsing is cached, because result of the analyzer depends on the current scope.
+        """
+        missing = [text for text in dict.fromkeys(texts) if text not in self.expressions]
+        parsed = None
+        if len(missing) > 1 and all(text and text == text.strip() and '\n' not in text for text in missing):
+            try:
+                parsed = self.analyzer.ast.evalMany(compiler.Tokenizer('\n'.join(missing) + '\n').lexer)
+            except SyntaxError:
+                parsed = None
+            if parsed is not None and len(parsed) != len(missing):
+                parsed = None
+        if parsed is None:
+            parsed = [self.analyzer.ast.eval(compiler.Tokenizer(text).lexer) for text in missing]
+        for text, tree in zip(missing, parsed):
+            try:
+                self.expressions[text] = encodeTree(tree)
+            except ValueError:
+                continue
+
+        result = list()
+        for text in texts:
+            if (data := self.expressions.get(text)) is not None:
+                result.append(decodeTree(data))
+            else:
+                result.append(self.analyzer.ast.eval(compiler.Tokenizer(text).lexer))
+        return result
+
     def exec(self, text: str) -> Any:
         """
         This method is used to execute a string.
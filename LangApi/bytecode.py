@@ -8,7 +8,7 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from json import dumps
@@ -16,7 +16,7 @@ from json import dumps
 # Custom libraries
 # ----------------
 
-...
+from components.kiwiScope import convertName
 
 const_predicate_true = {
     "condition": "minecraft:value_check",
@@ -38,16 +38,153 @@ _unary_slash = '\\'
 NBTLiteral = Dict[str, Any] | List[Any]
 
 
-def convert_var_name(name: str) -> str:
-    mode = True
-    result = str()
-    for symbol in name:
-        if mode == symbol.isupper():
-            mode = not mode
-            result += '-'
-            symbol = symbol.lower()
-        result += symbol
-    return result
+def evaluate_predicate(predicate: NBTLiteral) -> Optional[bool]:
+    """
+    Evaluates the predicate at compile time.
+    It returns None, if the result depends on the game state.
+    """
+    if not isinstance(predicate, dict):
+        return None
+    match predicate.get('condition'):
+        case 'minecraft:value_check':
+            value, bounds = predicate.get('value'), predicate.get('range')
+            if not isinstance(value, int):
+                return None
+            if isinstance(bounds, int):
+                return value == bounds
+            if isinstance(bounds, dict) and all(isinstance(x, int) for x in bounds.values()):
+                return bounds.get('min', value) <= value <= bounds.get('max', value)
+            return None
+        case 'minecraft:inverted':
+            if (result := evaluate_predicate(predicate.get('term'))) is None:
+                return None
+            return not result
+        case 'minecraft:alternative':
+            results = list(map(evaluate_predicate, predicate.get('terms', list())))
+            if True in results:
+                return True
+            if None in results:
+                return None
+            return False
+    return None
+
+
+def _score_source(value: Any) -> Optional[tuple[str, str]]:
+    """
+    Returns name and objective of score number provider, which has fixed target.
+    """
+    if not isinstance(value, dict) or value.get('type') != 'minecraft:score':
+        return None
+    target = value.get('target')
+    if not isinstance(target, dict) or target.get('type') != 'minecraft:fixed':
+        return None
+    return target['name'], value['score']
+
+
+_int_min = -2 ** 31
+_int_max = 2 ** 31 - 1
+
+
+def _is_always_set(name: str) -> bool:
+    """
+    Score holders, which are created by compiler (temporary variables, checks, iterators),
+    are always set before they are checked, in contrast to variables of user.
+    """
+    return name.rsplit('.', 1)[-1].startswith('$')
+
+
+def _format_range(low: Optional[int], high: Optional[int]) -> str | int:
+    if low is not None and low == high:
+        return low
+    return f'{"" if low is None else low}..{"" if high is None else high}'
+
+
+def _match_steps(source: tuple[str, str], low: Optional[int], high: Optional[int],
+                 inverted: bool) -> Optional[List[CodeType]]:
+    """
+    Predicate takes the score, which isn't set, as 0, but execute step fails on it.
+    So the range, which contains 0, is checked by unless steps of the complement,
+    which are passed, if the score isn't set.
+    """
+    if (low is None or low <= 0) and (high is None or high >= 0):
+        complement = list()
+        if low is not None and low > _int_min:
+            complement.append(_format_range(None, low - 1))
+        if high is not None and high < _int_max:
+            complement.append(_format_range(high + 1, None))
+        if not inverted:
+            return [StepUnlessScoreMatch(*source, value) for value in complement]
+        if len(complement) != 1:
+            return None
+        return [StepIfScoreMatch(*source, complement[0])]
+    step_match = StepUnlessScoreMatch if inverted else StepIfScoreMatch
+    return [step_match(*source, _format_range(low, high))]
+
+
+def predicate_to_steps(predicate: NBTLiteral, inverted=False) -> Optional[List[CodeType]]:
+    """
+    Lowers the predicate to execute steps, which compare scores natively.
+    Only single score comparisons and conjunctions of them are supported,
+    in other cases it returns None, and the predicate file should be used.
+    Scores are compared with each other only if both of them are always set,
+    because missing score can't be taken as 0 by execute step.
+    """
+    if not isinstance(predicate, dict):
+        return None
+    match predicate.get('condition'):
+        case 'minecraft:value_check':
+            if (source := _score_source(predicate.get('value'))) is None:
+                return None
+            step_compare = StepUnlessScoreCompare if inverted else StepIfScoreCompare
+            bounds = predicate.get('range')
+            if isinstance(bounds, int):
+                return _match_steps(source, bounds, bounds, inverted)
+            if not isinstance(bounds, dict):
+                return None
+            low, high = bounds.get('min'), bounds.get('max')
+            if isinstance(low, int | None) and isinstance(high, int | None):
+                return _match_steps(source, low, high, inverted)
+            if not all(_is_always_set(x[0]) for x in (source, _score_source(low), _score_source(high)) if x):
+                return None
+            if low == high and (other := _score_source(low)) is not None:
+                return [step_compare(*source, '=', *other)]
+            if inverted and None not in (low, high):
+                return None
+            result = list()
+            for op, value in ('>=', low), ('<=', high):
+                if value is None:
+                    continue
+                if isinstance(value, int):
+                    if (steps := _match_steps(source, *((value, None) if op == '>=' else (None, value)),
+                                              inverted)) is None:
+                        return None
+                    result.extend(steps)
+                elif (other := _score_source(value)) is not None:
+                    result.append(step_compare(*source, op, *other))
+                else:
+                    return None
+            return result
+        case 'minecraft:inverted':
+            term = predicate.get('term')
+            if not inverted and isinstance(term, dict) and term.get('condition') == 'minecraft:alternative':
+                result = list()
+                for value in term.get('terms', list()):
+                    if evaluate_predicate(value) is False:
+                        continue
+                    if (steps := predicate_to_steps(value, inverted=True)) is None:
+                        return None
+                    result.extend(steps)
+                return result
+            return predicate_to_steps(term, inverted=not inverted)
+        case 'minecraft:alternative':
+            if len(terms := predicate.get('terms', list())) != 1:
+                return None
+            return predicate_to_steps(terms[0], inverted=inverted)
+    return None
+
+
+# Names are converted by every command, so converted names are cached
+convert_var_name = convertName
 
 
 class CodeType(ABC):
@@ -277,6 +414,50 @@ class StepIfScoreMatch(CodeType):
         return f'if score {name} {scoreboard} matches {self.value}'
 
 
+@dataclass
+class StepUnlessScoreMatch(CodeType):
+    name: str
+    scoreboard: str
+    value: str | int
+
+    def toCode(self) -> str:
+        name = convert_var_name(self.name)
+        scoreboard = convert_var_name(self.scoreboard)
+        return f'unless score {name} {scoreboard} matches {self.value}'
+
+
+@dataclass
+class StepIfScoreCompare(CodeType):
+    name: str
+    scoreboard: str
+    op: str
+    other_name: str
+    other_scoreboard: str
+
+    def toCode(self) -> str:
+        name = convert_var_name(self.name)
+        scoreboard = convert_var_name(self.scoreboard)
+        other_name = convert_var_name(self.other_name)
+        other_scoreboard = convert_var_name(self.other_scoreboard)
+        return f'if score {name} {scoreboard} {self.op} {other_name} {other_scoreboard}'
+
+
+@dataclass
+class StepUnlessScoreCompare(CodeType):
+    name: str
+    scoreboard: str
+    op: str
+    other_name: str
+    other_scoreboard: str
+
+    def toCode(self) -> str:
+        name = convert_var_name(self.name)
+        scoreboard = convert_var_name(self.scoreboard)
+        other_name = convert_var_name(self.other_name)
+        other_scoreboard = convert_var_name(self.other_scoreboard)
+        return f'unless score {name} {scoreboard} {self.op} {other_name} {other_scoreboard}'
+
+
 @dataclass
 class StepRun(CodeType):
     step: CodeType
@@ -7,66 +7,63 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, TYPE_CHECKING, Dict, Any
 from enum import Enum
-from copy import deepcopy
 import functools
 
 # Custom libraries
 # ----------------
 
-from components.kiwiScope import Attr, DirAttr
+from components.kiwiScope import Attr, DirAttr, convertName
 
 if TYPE_CHECKING:
     from LangApi.api import API
 
 
 def _StaticAttrCounter(function: Callable[[Prefix, int], Attr]) -> Callable[[], Attr]:
-    function.iterator = 0
     @functools.wraps(function)
     def _Counter(self: Prefix) -> Attr:
-        result = function.iterator  # noqa
-        function.iterator += 1  # noqa
+        result = self.counters.get(function.__name__, 0)
+        self.counters[function.__name__] = result + 1
         return function(self, result)
     return _Counter
 
 
 def _DefaultAttrCounter(function: Callable[[Prefix, int], Attr]) -> Callable[[], Attr]:
-    function.iterator = dict()
     @functools.wraps(function)
     def _Counter(self: Prefix) -> Attr:
         current_scope = self.api.getThisScope()
-        if current_scope in function.iterator.keys():  # noqa
-            result = function.iterator[current_scope]  # noqa
-            function.iterator[current_scope] += 1  # noqa
+        iterator = self.counters.setdefault(function.__name__, dict())
+        if current_scope in iterator.keys():
+            result = iterator[current_scope]
+            iterator[current_scope] += 1
         else:
-            function.iterator[current_scope] = 1  # noqa
-            result = 0  # noqa
+            iterator[current_scope] = 1
+            result = 0
         return function(self, result)
     return _Counter
 
 
 def _StaticNameCounter(function: Callable[[Prefix, int], str]) -> Callable[[], str]:
-    function.iterator = 0
     @functools.wraps(function)
     def _Counter(self: Prefix) -> str:
-        result = function.iterator  # noqa
-        function.iterator += 1  # noqa
+        result = self.counters.get(function.__name__, 0)
+        self.counters[function.__name__] = result + 1
         return function(self, result)
     return _Counter
 
 
 def _DefaultNameCounter(function: Callable[[Prefix, int], str]) -> Callable[[], str]:
-    function.iterator = dict()
     @functools.wraps(function)
     def _Counter(self: Prefix) -> str:
         current_scope = self.api.getThisScope()
-        if current_scope in function.iterator.keys():  # noqa
-            result = function.iterator[current_scope]  # noqa
-            function.iterator[current_scope] += 1  # noqa
+        iterator = self.counters.setdefault(function.__name__, dict())
+        if current_scope in iterator.keys():
+            result = iterator[current_scope]
+            iterator[current_scope] += 1
         else:
-            function.iterator[current_scope] = 1  # noqa
-            result = 0  # noqa
+            iterator[current_scope] = 1
+            result = 0
         return function(self, result)
     return _Counter
 
@@ -74,51 +71,21 @@ def _DefaultNameCounter(function: Callable[[Prefix, int], str]) -> Callable[[],
 def _FileName(function: Callable[[..., str], str]) -> Callable[[str], str]:
     @functools.wraps(function)
     def _Wrapper(self: Prefix, name: str) -> str:
-        result = function(self, name)
-        mode = True
-        final_result = str()
-        for symbol in result:
-            if mode == symbol.isupper():
-                mode = not mode
-                final_result += '-'
-                symbol = symbol.lower()
-            final_result += symbol
-        return final_result
+        return convertName(function(self, name))
     return _Wrapper
 
 
 def _FileAttr(function: Callable[[..., str], Attr]) -> Callable[[str], Attr]:
     @functools.wraps(function)
     def _Wrapper(self: Prefix, name: str) -> Attr:
-        result = function(self, name)
-        final_result = deepcopy(result)
-        for i in range(len(result)):
-            mode = True
-            string_result = str()
-            for symbol in result[i]:
-                if mode == symbol.isupper():
-                    mode = not mode
-                    string_result += '-'
-                    symbol = symbol.lower()
-                string_result += symbol
-            final_result[i] = string_result
-        return final_result
+        return function(self, name).toConverted()
     return _Wrapper
 
 
 def _FileAttrName(function: Callable[[..., Attr], str]) -> Callable[[Attr], str]:
     @functools.wraps(function)
     def _Wrapper(self: Prefix, name: Attr) -> str:
-        result = function(self, name)
-        mode = True
-        final_result = str()
-        for symbol in result:
-            if mode == symbol.isupper():
-                mode = not mode
-                final_result += '-'
-                symbol = symbol.lower()
-            final_result += symbol
-        return final_result
+        return convertName(function(self, name))
     return _Wrapper
 
 
@@ -130,9 +97,14 @@ class ScopeMode(Enum):
 class Prefix:
     mode: ScopeMode = ScopeMode.LOCAL
     api: API
+    counters: Dict[str, int | Dict[Any, int]]
+    """
+    Iterators of all counters, they are kept by prefix, so every compilation has its own counters.
+    """
 
     def __init__(self, api: API):
         self.api = api
+        self.counters = dict()
 
     # CONSTANT VALUES
     # ===============
@@ -0,0 +1,80 @@
+"""
+This module measures throughput of Kiwi lexer in megabytes per second.
+Every program of the corpus (or given source files) is repeated until the source
+has the requested size, then it's tokenized by Kiwi lexer and by the chain of
+Python tokenizer and post processors, which is used as a fallback.
+
+Usage:
+    python benchmarks/lexer.py
+    python benchmarks/lexer.py -s 8 path/to/main.kiwi
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import List, Callable
+from pathlib import Path
+from argparse import ArgumentParser
+from io import StringIO
+from time import perf_counter
+import sys
+
+# Custom libraries
+# ----------------
+
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from pegen.tokenizer import Tokenizer as PegenTokenizer  # noqa: E402
+from frontend.kiwiTokenizer import lex, Tokenize, Ignores, generate_tokens, ENDMARKER  # noqa: E402
+
+programs = Path(__file__).resolve().parent / 'programs'
+
+
+def fallback(text: str):
+    """
+    Tokenizes the text by the chain of Python tokenizer and post processors.
+    """
+    lexer = PegenTokenizer(Tokenize(Ignores(generate_tokens(StringIO(text).readline))))
+    while lexer.getnext().type != ENDMARKER:
+        pass
+
+
+def throughput(function: Callable[[str], object], text: str, repeat: int) -> float:
+    """
+    Returns the best throughput of the function in megabytes per second.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        function(text)
+        best = min(best, perf_counter() - start)
+    return len(text.encode()) / 2 ** 20 / best
+
+
+def main(arguments: List[str] = None):
+    argparser = ArgumentParser(description='Kiwi lexer benchmark')
+    argparser.add_argument('sources', nargs='*', type=str,
+                           help='Paths to source files, all programs of the corpus are used by default')
+    argparser.add_argument('-s', '--size', default=4.0, type=float,
+                           help='Size of tokenized source in megabytes')
+    argparser.add_argument('-r', '--repeat', default=3, type=int,
+                           help='How many times every source is tokenized')
+    options = argparser.parse_args(arguments)
+
+    sources = [Path(source) for source in options.sources] or sorted(programs.glob('*.kiwi'))
+    for source in sources:
+        text = source.read_text()
+        if not text.endswith('\n'):
+            text += '\n'
+        text *= max(1, int(options.size * 2 ** 20 / max(len(text.encode()), 1)))
+        fast = throughput(lex, text, options.repeat)
+        slow = throughput(fallback, text, options.repeat)
+        print(f'{source.stem:<20} lexer {fast:>7.2f} MB/s   fallback {slow:>7.2f} MB/s   '
+              f'speedup {fast / slow:>5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
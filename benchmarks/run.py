@@ -0,0 +1,173 @@
+"""
+This module runs the benchmark suite of Kiwi Compiler.
+Every program of the corpus is compiled as a separate project,
+then wall time of compiler stages, count of output files, count of
+emitted commands, count of commands, executed by offline interpreter,
+and analyzer throughput in AST nodes per second are written into JSON file.
+
+Usage:
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --compare results.json
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import List, Dict, Any
+from pathlib import Path
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import json
+import sys
+
+# Custom libraries
+# ----------------
+
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+import toml  # noqa: E402
+import compiler  # noqa: E402
+import components.kiwiASO as kiwi  # noqa: E402
+from components.kiwiTools import AST_Visitor  # noqa: E402
+from components.config import compilerVersion  # noqa: E402
+from components.kiwiInterpreter import Interpreter  # noqa: E402
+
+programs = Path(__file__).resolve().parent / 'programs'
+stages = ['tokenizer', 'parser', 'analyzer', 'api', 'optimizer', 'constructor']
+
+
+def countCommands(files: Dict[str, str]) -> int:
+    """
+    Returns count of commands in all function files.
+    """
+    result = 0
+    for path, content in files.items():
+        if not path.endswith('.mcfunction'):
+            continue
+        result += sum(1 for line in content.splitlines() if line.strip() and not line.startswith('#'))
+    return result
+
+
+def countNodes(node: Any) -> int:
+    """
+    Returns count of AST nodes and tokens in the tree.
+    """
+    if isinstance(node, list):
+        return sum(countNodes(item) for item in node)
+    if isinstance(node, kiwi.Token):
+        return 1
+    if isinstance(node, kiwi.AST):
+        return 1 + sum(countNodes(attribute) for _, attribute in AST_Visitor.getAttributes(node))
+    return 0
+
+
+def benchmark(program: Path, repeat: int) -> Dict[str, Any]:
+    """
+    Compiles the program in a temporary project several times,
+    the fastest time of every stage is taken.
+    """
+    with TemporaryDirectory() as directory:
+        project = Path(directory)
+        (project / 'src').mkdir()
+        (project / 'src' / 'main.kiwi').write_text(program.read_text())
+        with (project / 'kiwi_project.toml').open('w') as file:
+            toml.dump({
+                'project': {'project_name': program.stem, 'entry_file': 'main'},
+                'options': {'output_directory': str(project / 'bin')}
+            }, file)
+
+        timings: Dict[str, float] = dict()
+        total = float('inf')
+        builder = None
+        for _ in range(repeat):
+            start = perf_counter()
+            if builder is None:
+                builder = compiler.Builder(arguments=[str(project), '--no-cache'])
+            else:
+                builder.compile()
+            total = min(total, perf_counter() - start)
+            for stage in stages:
+                value = builder.timings.get(stage, 0.0)
+                timings[stage] = min(timings.get(stage, value), value)
+
+        tokenizer = compiler.Tokenizer(program.read_text())
+        tokenizer.tokenize()
+        nodes = countNodes(compiler.AST(tokenizer.lexer).module)
+        files = builder.constructor.files
+        return {
+            'stages': timings,
+            'total': total,
+            'nodes': nodes,
+            'analyzer_nodes_per_second': nodes / timings['analyzer'] if timings['analyzer'] else 0.0,
+            'files': len(files),
+            'commands': countCommands(files),
+            'executed': Interpreter(files).run().total
+        }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> bool:
+    """
+    Prints difference between results and baseline.
+    Returns False, if any program emits more commands or compiles slower than tolerance allows.
+    """
+    success = True
+    for name, result in results['programs'].items():
+        if (previous := baseline['programs'].get(name)) is None:
+            print(f'{name}: new program')
+            continue
+        messages = list()
+        for key in ['files', 'commands', 'executed']:
+            if key in previous and result[key] > previous[key]:
+                success = False
+                messages.append(f'{key} {previous[key]} -> {result[key]}')
+        if result['total'] > previous['total'] * (1 + tolerance):
+            success = False
+            messages.append(f'time {previous["total"]:.6f} -> {result["total"]:.6f}')
+        print(f'{name}: {", ".join(messages) if messages else "ok"}')
+    return success
+
+
+def main(arguments: List[str] = None):
+    argparser = ArgumentParser(description='Kiwi Compiler benchmarks')
+    argparser.add_argument('programs', nargs='*', type=str,
+                           help='Names of programs to run, all programs are run by default')
+    argparser.add_argument('-o', '--output', default=None, type=str,
+                           help='Path to JSON file with results')
+    argparser.add_argument('-r', '--repeat', default=5, type=int,
+                           help='How many times every program is compiled')
+    argparser.add_argument('--compare', default=None, type=str,
+                           help='Path to JSON file with previous results')
+    argparser.add_argument('--tolerance', default=0.25, type=float,
+                           help='Allowed relative slowdown of compile time')
+    options = argparser.parse_args(arguments)
+
+    compiler.init()
+    results = {
+        'version': compilerVersion,
+        'repeat': options.repeat,
+        'programs': dict()
+    }
+    for program in sorted(programs.glob('*.kiwi')):
+        if options.programs and program.stem not in options.programs:
+            continue
+        results['programs'][program.stem] = result = benchmark(program, options.repeat)
+        print(f'{program.stem:<20} {result["total"]:.6f}s {result["files"]:>4} files '
+              f'{result["commands"]:>6} commands {result["executed"]:>6} executed '
+              f'{result["analyzer_nodes_per_second"]:>10.0f} nodes/s')
+
+    if options.output is not None:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=4)
+    if options.compare is not None:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, options.tolerance):
+            exit(1)
+
+
+if __name__ == '__main__':
+    main()
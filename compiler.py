@@ -8,18 +8,30 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from time import time
-from typing import List
+from time import time, sleep, perf_counter
+from typing import List, Dict, Optional, Iterator, Any
+from contextlib import contextmanager, nullcontext, redirect_stdout, redirect_stderr
 from pathlib import Path
+from traceback import format_exc
+from io import StringIO
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+import re
+import sys
 
 # Custom libraries
 # ----------------
 
 import components.kiwiConstructor as KiwiConstructor
+from components.kiwiCache import BuildCache
+import components.kiwiOptimizer as kiwiOptimizer
+from components.kiwiProfiler import Profiler, formatReport
+from components.kiwiMemo import MemoCache, Statistics, mergeStatistics
+from components.kiwiServer import Server
 from components.kiwiTools import (
     dumpAST, dumpTokenizer, dumpScopeSystem, getSomeModule
 )
 from components.config import Terminal, ConfigGeneral
+import components.kiwiASO as kiwi
 import components.kiwiColors as colors
 
 from frontend.kiwiTokenizer import Tokenizer
@@ -39,6 +51,65 @@ def init():
     LangApi.api.init(getSomeModule(__name__), LangApi, Kiwi)
 
 
+# Process pool workers
+# --------------------
+
+_worker: Optional[Builder] = None
+
+
+def initWorker(configGeneral: ConfigGeneral):
+    global _worker
+    init()
+    _worker = Builder(configGeneral)
+
+
+def compileModule(directory: Path) -> tuple[
+        tuple[Dict[str, str], List[Path], Dict[str, float], Dict[str, int]] | int, str]:
+    """
+    Compiles the module in worker process, and returns its result with everything, that was printed,
+    so the main process prints it by itself. If compiling is stopped, exit code is returned instead of result.
+    """
+    output = StringIO()
+    with redirect_stdout(output):
+        try:
+            return _worker.compileModule(directory), output.getvalue()
+        except SystemExit as e:
+            return e.code, output.getvalue()
+
+
+def compileJob(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compiles the project, which is requested by compile server.
+    Everything, that compiler prints, is returned as diagnostics.
+    """
+    output = StringIO()
+    result = {'success': False, 'time': 0.0, 'timings': dict(), 'files': 0}
+    time_start = perf_counter()
+    overrides = dict(job.get('config', dict()))
+    if job.get('output') is not None:
+        overrides['output_directory'] = job['output']
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            builder = Builder(arguments=[job['path'], *job.get('arguments', list())], overrides=overrides)
+            result |= {
+                'success': True,
+                'timings': builder.timings,
+                'files': len(builder.constructor.files)
+            }
+        except SystemExit as e:
+            result['success'] = e.code in {0, None}
+        except Exception:  # noqa
+            print(format_exc())
+    result['time'] = perf_counter() - time_start
+    result['diagnostics'] = re.sub(r'\x1b\[[0-9;]*m', '', output.getvalue())
+    return result
+
+
+def mergeCounters(target: Dict[str, float | int], source: Dict[str, float | int]):
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+
+
 class Builder:
     """
     The main task of this class is
@@ -50,6 +121,7 @@ class Builder:
 
     terminal: Terminal
     constructor: KiwiConstructor.Constructor
+    cache: BuildCache
 
     tokenizer: Tokenizer
     ast: AST
@@ -61,6 +133,41 @@ class Builder:
 
     configGeneral: ConfigGeneral
     include_directories: List[Path]
+    graph: Dict[Path, List[Path]]
+    """
+    Import graph, every module is mapped to modules, which it imports.
+    """
+    timings: Dict[str, float]
+    """
+    Wall time of every compiler stage in seconds, it's summed over all modules.
+    """
+    memo: Statistics
+    """
+    Hits, misses and backtracking of every parser rule,
+    they are collected only in profile or bounded memo mode.
+    """
+    profiler: Optional[Profiler] = None
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        This method adds wall time of the block to the given stage.
+        """
+        start = perf_counter()
+        try:
+            with nullcontext() if self.profiler is None else self.profiler.stage(stage):
+                yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + perf_counter() - start
+
+    def createProfiler(self, name: str):
+        """
+        This method creates profiler of module, if profile output is given.
+        """
+        if self.configGeneral['profile_output'] is None:
+            self.profiler = None
+            return
+        self.profiler = Profiler(Path(self.configGeneral['profile_output']), name)
 
     def getPath(self, file_name: str) -> Path:
         """
@@ -73,36 +180,175 @@ class Builder:
                 path = path.with_suffix('.kiwi')
             if path.exists():
                 return path
+        raise FileNotFoundError(file_name)
+
+    def getModuleName(self, directory: Path) -> str:
+        """
+        This method returns the name of imported module,
+        it's the path relatively to include directory, joined with dots.
+        """
+        for path in map(lambda x: Path(self.configGeneral['path']) / x, self.include_directories):
+            if directory.is_relative_to(path):
+                return '.'.join(directory.relative_to(path).with_suffix('').parts)
         assert False
 
-    def openModule(self, directory: Path) -> tuple[Tokenizer, AST, kiwiAnalyzer.Analyzer, LangApi.api.API]:
+    def resolveImports(self, directory: Path, module: kiwi.Module) -> List[Path]:
+        """
+        This method returns paths of all modules, which are imported by the given module.
+        """
+        result = list()
+        for alias in module.imports:
+            try:
+                path = self.getPath(alias.directory.replace('.', '/'))
+            except FileNotFoundError:
+                print(f'{colors.Red}Kiwi Error System:')
+                print(f'  File "{directory.absolute()}", line {alias.start[0]}')
+                print(f'ImportError: No module named "{alias.directory}"{colors.Default}')
+                exit(1)
+            if path not in result:
+                result.append(path)
+        return result
+
+    def openModule(self, directory: Path, name: str = None) -> tuple[
+            Optional[Tokenizer], Optional[AST], Optional[kiwiAnalyzer.Analyzer], Optional[LangApi.api.API]]:
         """
         This method opens the module and returns the module components.
+        If the module hasn't been changed since the last build,
+        its files are taken from the build cache, and nothing is returned.
+        Imported modules are written into the import graph.
         """
         with directory.open() as file:
             text = file.read()
-            tokenizer = Tokenizer(text)
+            if (cached := self.cache.load(directory, text)) is not None:
+                files, self.graph[directory] = cached
+                self.constructor.include(files)
+                return None, None, None, None
+            with self.measure('parser'):
+                tree = self.cache.loadTree(directory, text)
             try:
-                ast = AST(tokenizer.lexer)
+                if tree is not None:
+                    # Tokens are used only to dump them in debug mode, where cache is disabled
+                    tokenizer, ast = None, AST.fromModule(tree)
+                else:
+                    with self.measure('tokenizer'):
+                        tokenizer = Tokenizer(text)
+                        tokenizer.tokenize()
+                    cache = MemoCache(self.configGeneral['bounded_memo']) \
+                        if self.configGeneral['profile'] or self.configGeneral['bounded_memo'] else None
+                    with self.measure('parser'):
+                        ast = AST(tokenizer.lexer, cache)
+                    if cache is not None:
+                        mergeStatistics(self.memo, cache.rules)
             except SyntaxError as e:
                 print(f'{colors.Red}Kiwi Error System:')
                 print(f'  File "{directory.absolute()}", line {e.lineno}')
                 print(f'    {e.text}    {"^".rjust(e.offset)}\nSyntaxError: {e.msg}{colors.Default}')
                 exit(1)
             assert ast.module is not None
-            api = LangApi.api.API(self.constructor, self, tokenizer, ast)
+            if tree is None:
+                self.cache.saveTree(directory, text, ast.module)
+            self.graph[directory] = self.resolveImports(directory, ast.module)
+            api = LangApi.api.API(self.constructor, self, tokenizer, ast, name)
             if self.configGeneral['debug']:
                 print(dumpAST(ast.module))
-            analyzer = kiwiAnalyzer.Analyzer(self.constructor, self, tokenizer, ast, api, text)
-            analyzer.visit(ast.module)
+            with self.measure('analyzer'):
+                analyzer = kiwiAnalyzer.Analyzer(self.constructor, self, tokenizer, ast, api, text)
+                analyzer.visit(ast.module)
             if self.configGeneral['debug']:
                 print(dumpAST(ast.module, minimalistic = self.configGeneral['minimalistic']))
-            api.visit(ast.module)
+            with self.measure('api'):
+                api.visit(ast.module)
+            with self.measure('optimizer'):
+                if self.configGeneral['peephole']:
+                    report = kiwiOptimizer.peephole(api.code)
+                    if self.configGeneral['report']:
+                        print(f'{colors.Yellow}Optimizer removed {sum(report.values())} commands in '
+                              f'"{directory.absolute()}"{colors.Default}')
+                        for path, removed in sorted(report.items()):
+                            print(f'  {path}: {removed}')
+                if self.configGeneral['inline_functions']:
+                    inlined = kiwiOptimizer.inlineFunctions(api.code)
+                    if self.configGeneral['report']:
+                        print(f'{colors.Yellow}Optimizer inlined {inlined} functions in '
+                              f'"{directory.absolute()}"{colors.Default}')
+                if self.configGeneral['reuse_temporaries']:
+                    kiwiOptimizer.allocateTemporaries(api.code)
+            with self.measure('constructor'):
+                files = self.constructor.collect(api.code)
+            self.cache.save(directory, text, files, self.graph[directory])
+            self.constructor.include(files)
             return tokenizer, analyzer.ast, analyzer, api
 
-    def __init__(self):
-        self.terminal = Terminal()
+    def compileModule(self, directory: Path) -> tuple[
+            Dict[str, str], List[Path], Dict[str, float], Statistics]:
+        """
+        This method compiles an imported module apart from other modules,
+        and returns its files, modules, which it imports, stage timings and memo statistics.
+        It's called by workers of the process pool.
+        """
+        self.graph = dict()
+        self.timings = dict()
+        self.memo = dict()
+        self.constructor = KiwiConstructor.Constructor(self)
+        name = self.getModuleName(directory)
+        self.createProfiler(name)
+        self.openModule(directory, name)
+        if self.profiler is not None:
+            self.profiler.dump()
+        return self.constructor.files, self.graph[directory], self.timings, self.memo
+
+    def compileImports(self, entry: Path):
+        """
+        This method compiles all modules, which are imported by the entry module
+        directly or not. Independent modules are compiled in parallel by the process pool,
+        and their files are merged in order of module names.
+        """
+        if not self.graph[entry]:
+            return
+        results = dict()
+        with ProcessPoolExecutor(
+                self.configGeneral['jobs'], initializer=initWorker, initargs=(self.configGeneral,)
+        ) as executor:
+            running: Dict[Future, Path] = dict()
+
+            def submit(paths: List[Path]):
+                for path in paths:
+                    if path in self.graph or path in running.values():
+                        continue
+                    running[executor.submit(compileModule, path)] = path
+
+            submit(self.graph[entry])
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    result, output = future.result()
+                    print(output, end='')
+                    if not isinstance(result, tuple):
+                        exit(result)
+                    results[path], self.graph[path], timings, memo = result
+                    mergeCounters(self.timings, timings)
+                    mergeStatistics(self.memo, memo)
+                    submit(self.graph[path])
+        for path in sorted(results, key=self.getModuleName):
+            self.constructor.include(results[path])
+
+    def __init__(self, configGeneral: ConfigGeneral = None, arguments: List[str] = None,
+                 overrides: Dict[str, Any] = None):
+        if configGeneral is not None:
+            # Worker of process pool, modules are given by the main builder
+            self.configGeneral = configGeneral
+            self.cache = BuildCache(self)
+            self.include_directories = list(map(Path, self.configGeneral['include_directories']))
+            return
+
+        self.terminal = Terminal(arguments)
         self.configGeneral = self.terminal.configGeneral
+        if overrides is not None:
+            self.configGeneral |= overrides
+
+        if self.configGeneral['serve']:
+            return
 
         if self.configGeneral['create_project']:
             path = Path(self.configGeneral['path'])
@@ -122,6 +368,13 @@ class Builder:
                         'output_directory': 'bin',
                         'default_scope': 'public',
                         'space_separator': '.'
+                    },
+                    'optimizations': {
+                        'score_conditions': True,
+                        'reuse_temporaries': True,
+                        'peephole': True,
+                        'inline_functions': True,
+                        'deduplicate': True
                     }
                 }, file)
             with (path / 'src' / 'main.kiwi').open('w+') as file:
@@ -141,16 +394,28 @@ class Builder:
             if result.returncode != 0:
                 exit(1)
 
+        self.cache = BuildCache(self)
+        if self.configGeneral['update_grammar']:
+            self.cache.clearTrees()
+        self.include_directories = list(map(Path, self.configGeneral['include_directories']))
+        self.compile()
+
+    def compile(self):
+        """
+        This method compiles the whole project and builds the datapack.
+        """
+
         # Entry file initialization
         # -------------------------
 
+        self.graph = dict()
+        self.timings = dict()
+        self.memo = dict()
+        self.createProfiler('--main--')
         self.constructor = KiwiConstructor.Constructor(self)
-        self.include_directories = list(map(Path, self.configGeneral['include_directories']))
-        self.tokenizer, self.ast, self.analyzer, self.api = self.openModule(
-            self.getPath(
-                self.configGeneral['entry_file']
-            )
-        )
+        entry = self.getPath(self.configGeneral['entry_file'])
+        self.tokenizer, self.ast, self.analyzer, self.api = self.openModule(entry)
+        self.compileImports(entry)
 
         # Only for debugging
         # ------------------
@@ -162,16 +427,76 @@ class Builder:
         # Building project
         # ----------------
 
-        self.constructor.build()
+        with self.measure('constructor'):
+            self.constructor.build()
+
+        if self.profiler is not None:
+            self.profiler.dump()
+        if self.configGeneral['profile']:
+            print(formatReport(self.timings, self.memo))
 
         if self.configGeneral['debug']:
+            files = self.constructor.files
             self.configGeneral['output_directory'] = 'bin'
             self.constructor = KiwiConstructor.Constructor(self)
+            self.constructor.include(files)
             self.constructor.build()
 
+    def sources(self) -> Dict[Path, tuple[int, int]]:
+        """
+        This method returns modification time and size of every module in include directories.
+        """
+        result = dict()
+        for directory in self.include_directories:
+            for path in (Path(self.configGeneral['path']) / directory).rglob('*.kiwi'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                result[path.resolve()] = stat.st_mtime_ns, stat.st_size
+        return result
+
+    def watch(self, interval: float = 0.05):
+        """
+        This method keeps the compiler warm and rebuilds the project
+        every time when any module in include directories is changed.
+        Unchanged modules are taken from the build cache.
+        """
+        sources = self.sources()
+        print(f'Watching for changes in {len(sources)} modules, press Ctrl+C to stop')
+        try:
+            while True:
+                sleep(interval)
+                if (current := self.sources()) == sources:
+                    continue
+                sources = current
+                time_start = time()
+                try:
+                    self.compile()
+                except SystemExit:
+                    continue
+                except Exception:  # noqa
+                    print(f'{colors.Red}{format_exc()}{colors.Default}')
+                    continue
+                print('Compiled successfully in %6f seconds' % (time() - time_start))
+        except KeyboardInterrupt:
+            pass
+
 
 if __name__ == '__main__':
     time_start = time()
     init()
-    Builder()
+    builder = Builder()
+    if builder.configGeneral['serve']:
+        server = Server(compileJob, init, builder.configGeneral['jobs'])
+        try:
+            if builder.configGeneral['port'] is None:
+                server.serveStream(sys.stdin, sys.stdout)
+            else:
+                server.serveSocket(builder.configGeneral['port'])
+        finally:
+            server.shutdown()
+        exit(0)
     print('Compiled successfully in %6f seconds' % (time() - time_start))
+    if builder.configGeneral['watch']:
+        builder.watch()
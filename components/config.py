@@ -7,7 +7,7 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import Any, TypedDict, List
+from typing import Any, TypedDict, List, Optional
 from pathlib import Path
 from argparse import ArgumentParser
 
@@ -17,6 +17,8 @@ from argparse import ArgumentParser
 import toml
 import components.kiwiColors as colors
 
+compilerVersion = '0.0.5'
+
 # Dict with default values
 # ------------------------
 
@@ -86,16 +88,35 @@ configProject: ConfigProject = {
 }
 
 
+class ConfigOptimizations(TypedDict):
+    score_conditions: bool
+    reuse_temporaries: bool
+    peephole: bool
+    inline_functions: bool
+    deduplicate: bool
+
+
+configOptimizations: ConfigOptimizations = {
+    "score_conditions": True,
+    "reuse_temporaries": True,
+    "peephole": True,
+    "inline_functions": True,
+    "deduplicate": True
+}
+
+
 class ConfigTOML(TypedDict):
     project: ConfigProject
     options: ConfigOptions
     extended: ConfigExtended
+    optimizations: ConfigOptimizations
 
 
 configTOML: ConfigTOML = {
     "project": configProject,
     "options": configOptions,
-    "extended": configExtended
+    "extended": configExtended,
+    "optimizations": configOptimizations
 }
 
 
@@ -108,12 +129,23 @@ class ConfigTerminal(TypedDict):
     minimalistic: bool
     create_project: bool
     update_grammar: bool
+    no_cache: bool
+    zip: bool
+    compact: bool
+    watch: bool
+    jobs: Optional[int]
+    report: bool
+    profile: bool
+    profile_output: Optional[str]
+    bounded_memo: bool
+    serve: bool
+    port: Optional[int]
 
 
 # General config
 # --------------
 
-class ConfigGeneral(ConfigProject, ConfigOptions, ConfigTerminal):
+class ConfigGeneral(ConfigProject, ConfigOptions, ConfigOptimizations, ConfigTerminal):
     pass
 
 
@@ -131,17 +163,17 @@ class Terminal:
     # Config options
     # --------------
 
-    def __init__(self):
-        self.get_arguments()
-        if self.arguments['create_project']:
+    def __init__(self, arguments: List[str] = None):
+        self.get_arguments(arguments)
+        if self.arguments['create_project'] or self.arguments['serve']:
             self.configGeneral = dict()
             self.configGeneral |= self.arguments
             return
         self.get_options()
 
-    def get_arguments(self):
+    def get_arguments(self, arguments: List[str] = None):
         self.argparser = ArgumentParser(description='Frontend Datapack Official Compiler')
-        self.argparser.add_argument('path', type=str, help='Path to your project')
+        self.argparser.add_argument('path', type=str, nargs='?', default=None, help='Path to your project')
         self.argparser.add_argument('--debug', default=False, action='store_true',
                                     help='Compiles grammar and print details (for devs)')
         self.argparser.add_argument('--create-project', default=False, action='store_true',
@@ -150,8 +182,35 @@ class Terminal:
                                     help='Updates grammar')
         self.argparser.add_argument('--minimalistic', default=False, action='store_true',
                                     help='Less debug code (for devs)')
-        self.arguments = vars(self.argparser.parse_args())
-        self.pathGeneral = Path(self.arguments['path'])
+        self.argparser.add_argument('--no-cache', default=False, action='store_true',
+                                    help='Rebuilds all modules and output files')
+        self.argparser.add_argument('--zip', default=False, action='store_true',
+                                    help='Builds datapack into zip archive near output directory')
+        self.argparser.add_argument('--compact', default=False, action='store_true',
+                                    help='Minifies JSON and replaces internal names by short ones, '
+                                         'the symbol map is written near output directory')
+        self.argparser.add_argument('--watch', default=False, action='store_true',
+                                    help='Rebuilds project every time when any module is changed')
+        self.argparser.add_argument('-j', '--jobs', default=None, type=int,
+                                    help='Number of processes, which compile imported modules or jobs of compile server')
+        self.argparser.add_argument('--report', default=False, action='store_true',
+                                    help='Prints how many commands were removed in every function by optimizer')
+        self.argparser.add_argument('--profile', default=False, action='store_true',
+                                    help='Prints wall time of every compiler stage and memo statistics of parser')
+        self.argparser.add_argument('--profile-output', default=None, type=str,
+                                    help='Directory, where pstats and collapsed stacks of every stage are written')
+        self.argparser.add_argument('--bounded-memo', default=False, action='store_true',
+                                    help='Parser forgets memo entries behind top-level statements (less memory)')
+        self.argparser.add_argument('--serve', default=False, action='store_true',
+                                    help='Runs compile server, which reads jobs in JSON lines format from stdin')
+        self.argparser.add_argument('--port', default=None, type=int,
+                                    help='Compile server reads jobs from local socket with given port instead of stdin')
+        self.arguments = vars(self.argparser.parse_args(arguments))
+        if self.arguments['path'] is None and not self.arguments['serve']:
+            self.argparser.error('the following arguments are required: path')
+        if self.arguments['profile_output'] is not None:
+            self.arguments['profile'] = True
+        self.pathGeneral = Path(self.arguments['path'] or '.')
 
     def get_options(self):
         def combineDictionaries(*values: DefaultDict | dict) -> dict:
@@ -177,7 +236,11 @@ class Terminal:
             = DefaultDict(configExtended, currentConfigTOML['extended'])
         currentConfigOptions: ConfigOptions \
             = DefaultDict(configOptions, currentConfigTOML['options'])
+        currentConfigOptimizations: ConfigOptimizations \
+            = DefaultDict(configOptimizations, currentConfigTOML['optimizations'])
         self.configGeneral = combineDictionaries(
             self.arguments, currentConfigProject,
-            currentConfigExtended, currentConfigOptions)
-        self.configGeneral['include_directories'].append('./')
\ No newline at end of file
+            currentConfigExtended, currentConfigOptions,
+            currentConfigOptimizations)
+        # Default list is shared by all builds of compile server, so it's copied
+        self.configGeneral['include_directories'] = [*self.configGeneral['include_directories'], './']
\ No newline at end of file
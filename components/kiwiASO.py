@@ -1,6 +1,7 @@
 """
 This module contains all the AST nodes.
 It's used by the second step of frontend (parser).
+All the nodes are slotted, because large modules produce lots of them.
 """
 
 from __future__ import annotations
@@ -10,6 +11,7 @@ from __future__ import annotations
 
 from typing import List, Type
 from dataclasses import dataclass, field
+from bisect import bisect_right
 
 # Custom libraries
 # ----------------
@@ -22,26 +24,32 @@ from components.kiwiScope import Attr, DirAttr  # noqa
 # ------------------
 
 class Theme_Undefined:
+    __slots__ = ()
     color = colors.White + colors.BackgroundDefault
 
 
 class Theme_Start:
+    __slots__ = ()
     color = colors.Red + colors.BackgroundDefault
 
 
 class Theme_Statements:
+    __slots__ = ()
     color = colors.White + colors.BackgroundDefault
 
 
 class Theme_CStatements:
+    __slots__ = ()
     color = colors.Yellow + colors.BackgroundDefault
 
 
 class Theme_Expressions:
+    __slots__ = ()
     color = colors.Cyan + colors.BackgroundDefault
 
 
 class Theme_Tokens:
+    __slots__ = ()
     color = colors.Magenta + colors.BackgroundBlack
 
 
@@ -49,13 +57,13 @@ class Theme_Tokens:
 # ==============
 
 
-@dataclass
+@dataclass(slots=True)
 class AST(Theme_Undefined):
     start: tuple[int, int]
     end: tuple[int, int]
 
 
-@dataclass
+@dataclass(slots=True)
 class Module(Theme_Start, AST):
     imports: List[Alias]
     body: List[statement]
@@ -65,7 +73,7 @@ class Module(Theme_Start, AST):
 # =================
 
 
-@dataclass
+@dataclass(slots=True)
 class Alias(Theme_Expressions, AST):
     directory: Name
     as_name: Name | List[Alias]
@@ -75,22 +83,22 @@ class Alias(Theme_Expressions, AST):
 # =================
 
 
-@dataclass
+@dataclass(slots=True)
 class Pass(Theme_Statements, AST):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Break(Theme_Statements, AST):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Continue(Theme_Statements, AST):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class AnnAssignment(Theme_Statements, AST):
     targets: List[expression]
     data_type: data_type
@@ -98,27 +106,27 @@ class AnnAssignment(Theme_Statements, AST):
     values: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Assignment(Theme_Statements, AST):
     targets: List[expression]
     values: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class AugAssignment(Theme_Statements, AST):
     targets: List[expression]
     op: Token
     values: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Annotation(Theme_Statements, AST):
     targets: List[expression]
     data_type: data_type
     args: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Return(Theme_Statements, AST):
     value: expression
 
@@ -127,33 +135,33 @@ class Return(Theme_Statements, AST):
 # ===================
 
 
-@dataclass
+@dataclass(slots=True)
 class NamespaceDef(Theme_CStatements, AST):
     name: Name
     blocks: List[Type[AnyBlock]]
 
 
-@dataclass
+@dataclass(slots=True)
 class AnyBlock(Theme_Statements, AST):
     body: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class PrivateBlock(AnyBlock):
     ...
 
 
-@dataclass
+@dataclass(slots=True)
 class PublicBlock(AnyBlock):
     ...
 
 
-@dataclass
+@dataclass(slots=True)
 class DefaultBlock(AnyBlock):
     ...
 
 
-@dataclass
+@dataclass(slots=True)
 class FuncDef(Theme_CStatements, AST):
     name: Name
     params: List[Parameter | RefParameter]
@@ -163,48 +171,48 @@ class FuncDef(Theme_CStatements, AST):
     body: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnParameter(Theme_Statements, AST):
     data_type: data_type
     args: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnRefParameter(Theme_Statements, AST):
     target: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter(Theme_Statements, AST):
     targets: List[expression]
     data_type: data_type
     args: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class RefParameter(Theme_Statements, AST):
     target: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class LambdaDef(Theme_Statements, AST):
     targets: List[expression]
     returns: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class LambdaParameter(Theme_Statements, AST):
     target: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class IfElse(Theme_CStatements, AST):
     condition: expression
     then: List[statement]
     or_else: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class ForClassic(Theme_CStatements, AST):
     init: statement
     condition: expression
@@ -212,7 +220,7 @@ class ForClassic(Theme_CStatements, AST):
     body: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class ForIterator(Theme_CStatements, AST):
     targets: List[expression]
     parent: expression
@@ -221,19 +229,19 @@ class ForIterator(Theme_CStatements, AST):
     body: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class While(Theme_CStatements, AST):
     condition: expression
     body: List[statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchCase(Theme_CStatements, AST):
     value: expression
     cases: List[Case]
 
 
-@dataclass
+@dataclass(slots=True)
 class Case(Theme_Statements, AST):
     key: expression
     body: List[statement]
@@ -243,13 +251,13 @@ class Case(Theme_Statements, AST):
 # ===========
 
 
-@dataclass
+@dataclass(slots=True)
 class Range(Theme_Expressions, AST):
     expr_start: expression
     expr_end: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class Expression(Theme_Expressions, AST):
     value: expression
     isGroup: bool = field(default=False)
@@ -259,49 +267,49 @@ class Expression(Theme_Expressions, AST):
         return self
 
 
-@dataclass
+@dataclass(slots=True)
 class IfExpression(Theme_Expressions, AST):
     condition: expression
     then: expression
     or_else: expression
 
 
-@dataclass
+@dataclass(slots=True)
 class Disjunctions(Theme_Expressions, AST):
     values: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Conjunctions(Theme_Expressions, AST):
     values: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Comparisons(Theme_Expressions, AST):
     values: List[expression]
     ops: List[Token]
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Theme_Expressions, AST):
     x: expression
     op: Token
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(Theme_Expressions, AST):
     x: expression
     y: expression
     op: Token
 
 
-@dataclass
+@dataclass(slots=True)
 class Call(Theme_Expressions, AST):
     target: expression
     args: List[expression]
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute(Theme_Expressions, AST):
     target: expression
     attribute: Name
@@ -314,13 +322,13 @@ class Attribute(Theme_Expressions, AST):
 # ==========
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchExpr(Theme_Expressions, AST):
     value: expression
     cases: List[MatchKey]
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchKey(Theme_Expressions, AST):
     from_this: expression
     to_this: expression
@@ -328,6 +336,7 @@ class MatchKey(Theme_Expressions, AST):
 
 
 class Token(Theme_Tokens):
+    __slots__ = ('start', 'end', 'value')
     start: tuple[int, int]
     end: tuple[int, int]
     value: str
@@ -343,23 +352,69 @@ class Token(Theme_Tokens):
         return self.value
 
 
+# POSITIONS
+# =========
+
+
+class LineIndex:
+    """
+    Offsets of lines in the source text.
+    Nodes keep positions of tokens as (line, column),
+    this index converts them into offsets and back on demand.
+    """
+    __slots__ = ('text', 'starts', 'ends')
+    text: str
+    starts: List[int]
+    ends: List[int]
+    """
+    Offsets of line ends, excluding line breaks.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = list()
+        self.ends = list()
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            self.starts.append(offset)
+            self.ends.append(offset + len(line.rstrip('\r\n')))
+            offset += len(line)
+
+    def offset(self, position: tuple[int, int]) -> int:
+        """
+        Returns offset of the position, column is limited by the end of line.
+        """
+        line, column = position
+        return min(self.starts[line - 1] + column, self.ends[line - 1])
+
+    def position(self, offset: int) -> tuple[int, int]:
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1]
+
+    def source(self, node: AST | Token) -> str:
+        """
+        Returns source text of the node, including the character at the end position.
+        """
+        return self.text[self.offset(node.start):self.offset((node.end[0], node.end[1] + 1))]
+
+
 # STATES AND SELECTORS
 # ====================
 
 
-@dataclass
+@dataclass(slots=True)
 class Selector(Theme_Expressions, AST):
     target: str
     state: State
 
 
-@dataclass
+@dataclass(slots=True)
 class State(Theme_Expressions, AST):
     key: str
     value: NBT
 
 
-@dataclass
+@dataclass(slots=True)
 class NBT(Theme_Expressions, AST):
     tag: str
 
@@ -370,15 +425,19 @@ class NBT(Theme_Expressions, AST):
 
 
 class Name(Token):
+    __slots__ = ()
+
     def toAttr(self) -> Attr:
         return Attr([self.value])
 
 
 class Word(Token):
-    pass
+    __slots__ = ()
 
 
 class String(Token):
+    __slots__ = ()
+
     def getString(self) -> str:
         value = str()
         match self.value[-1]:
@@ -402,7 +461,7 @@ class String(Token):
 
 
 class Number(Token):
-    pass
+    __slots__ = ()
 
 
 expression = \
@@ -0,0 +1,305 @@
+"""
+This module provides the persistent build cache.
+It's used to skip modules, which haven't been changed since the last build,
+to skip parsing of modules, whose syntax tree has been saved before,
+and to rewrite only those output files, whose content has been changed.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+from pathlib import Path
+from hashlib import sha256
+from functools import cache
+from dataclasses import fields
+from array import array
+from shutil import rmtree
+import marshal
+import zlib
+import json
+
+# Custom libraries
+# ----------------
+
+from components.config import compilerVersion, configProject, configOptions, configExtended, configOptimizations
+import components.kiwiASO as kiwi
+
+if TYPE_CHECKING:
+    import compiler
+
+_outputKeys = sorted({*configProject, *configOptions, *configExtended, *configOptimizations, 'compact'})
+"""
+Options, which change generated code. Other terminal options (jobs, profile, watch, ...)
+don't invalidate cached modules.
+"""
+
+
+@cache
+def compilerDigest() -> str:
+    """
+    Returns the digest of compiler version and its own sources,
+    so any change of compiler invalidates all cached modules.
+    """
+    root = Path(__file__).parent.parent
+    result = sha256(compilerVersion.encode())
+    paths = [root / 'compiler.py', root / 'components' / 'kiwi.gram']
+    for package in ['components', 'frontend', 'LangApi', 'Kiwi']:
+        paths.extend((root / package).rglob('*.py'))
+    for path in sorted(paths):
+        result.update(path.relative_to(root).as_posix().encode())
+        result.update(path.read_bytes())
+    return result.hexdigest()
+
+
+@cache
+def grammarDigest() -> str:
+    """
+    Returns the digest of compiler version, grammar, generated parser and AST nodes,
+    so saved syntax trees are invalidated, when the grammar is updated.
+    """
+    root = Path(__file__).parent.parent
+    result = sha256(compilerVersion.encode())
+    for path in [root / 'components' / 'kiwi.gram', root / 'frontend' / 'kiwiParser.py',
+                 root / 'components' / 'kiwiASO.py']:
+        result.update(path.read_bytes())
+    return result.hexdigest()
+
+
+def contentDigest(content: str) -> str:
+    return sha256(content.encode()).hexdigest()
+
+
+# SYNTAX TREES
+# ============
+
+# Syntax tree is saved as a program of stack machine in postorder:
+# constants, lists and tuples are pushed, then nodes pop their fields.
+# Every node and list gets an index, so shared objects are saved only once.
+_CONSTANT, _LIST, _TUPLE, _REFERENCE, _NODE = range(5)
+_treeMagic = b'KAST1'
+
+
+def _nodeFields(node_type: type) -> tuple[str, ...]:
+    if issubclass(node_type, kiwi.Token):
+        return 'start', 'end', 'value'
+    return tuple(item.name for item in fields(node_type))
+
+
+def encodeTree(tree: kiwi.AST) -> bytes:
+    """
+    Returns compact binary form of the syntax tree.
+    It raises ValueError, if the tree has objects, which can't be saved.
+    """
+    codes = array('I')
+    constants: List[Any] = list()
+    names: List[str] = list()
+    classes: Dict[type, tuple[int, tuple[str, ...]]] = dict()
+    indices: Dict[int, int] = dict()
+    count = 0
+
+    stack: List[tuple[Any, bool]] = [(tree, False)]
+    while stack:
+        value, ready = stack.pop()
+        kind = type(value)
+        if ready:
+            if kind is list:
+                codes.append(_LIST)
+                codes.append(len(value))
+            elif kind is tuple:
+                codes.append(_TUPLE)
+                codes.append(len(value))
+                continue
+            else:
+                codes.append(_NODE + classes[kind][0])
+            indices[id(value)] = count
+            count += 1
+            continue
+        if kind is list or isinstance(value, (kiwi.AST, kiwi.Token)):
+            if (index := indices.get(id(value))) is not None:
+                codes.append(_REFERENCE)
+                codes.append(index)
+                continue
+            if kind is list:
+                children = value
+            else:
+                if (entry := classes.get(kind)) is None:
+                    if getattr(kiwi, kind.__name__, None) is not kind:
+                        raise ValueError(f'{kind.__name__} is not a node')
+                    entry = classes[kind] = len(names), _nodeFields(kind)
+                    names.append(kind.__name__)
+                children = [getattr(value, name) for name in entry[1]]
+            stack.append((value, True))
+            stack.extend((child, False) for child in reversed(children))
+        elif kind is tuple and any(type(item) in {list, tuple} or isinstance(item, (kiwi.AST, kiwi.Token))
+                                   for item in value):
+            stack.append((value, True))
+            stack.extend((child, False) for child in reversed(value))
+        else:
+            codes.append(_CONSTANT)
+            constants.append(value)
+    return marshal.dumps((names, codes.tobytes(), constants))
+
+
+def decodeTree(data: bytes) -> kiwi.AST:
+    """
+    Returns the syntax tree from its binary form (see encodeTree).
+    """
+    names, data, constants = marshal.loads(data)
+    codes = array('I')
+    codes.frombytes(data)
+    classes = [getattr(kiwi, name) for name in names]
+    sizes = [len(_nodeFields(node_type)) for node_type in classes]
+    constants = iter(constants)
+    objects: List[Any] = list()
+    stack: List[Any] = list()
+    push = stack.append
+
+    codes = iter(codes)
+    for code in codes:
+        if code == _CONSTANT:
+            push(next(constants))
+        elif code >= _NODE:
+            size = sizes[code - _NODE]
+            node = classes[code - _NODE](*stack[len(stack) - size:])
+            del stack[len(stack) - size:]
+            push(node)
+            objects.append(node)
+        elif code == _REFERENCE:
+            push(objects[next(codes)])
+        else:
+            size = next(codes)
+            value = stack[len(stack) - size:]
+            del stack[len(stack) - size:]
+            if code == _TUPLE:
+                push(tuple(value))
+                continue
+            push(value)
+            objects.append(value)
+    assert len(stack) == 1
+    return stack[0]
+
+
+class BuildCache:
+    """
+    The main task of this class is
+    - save emitted files of every module, keyed by source hash, compiler version and config
+    - save digests of files, which were written into output directory
+    """
+
+    enabled: bool
+    directory: Path
+    configDigest: str
+
+    def __init__(self, builder: compiler.Builder):
+        config = builder.configGeneral
+        self.enabled = not (config['no_cache'] or config['debug'])
+        self.directory = Path(config['path']) / '.kiwi_cache'
+        self.configDigest = contentDigest(json.dumps(
+            {key: config.get(key) for key in _outputKeys}, sort_keys=True, default=str))
+
+    @staticmethod
+    def _pathDigest(path: Path) -> str:
+        return contentDigest(str(path.absolute()))
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            with path.open() as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: Path, value: dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w') as file:
+            json.dump(value, file)
+
+    # MODULES
+    # =======
+
+    def moduleKey(self, text: str) -> str:
+        return contentDigest(compilerDigest() + self.configDigest + text)
+
+    def load(self, module: Path, text: str) -> Optional[tuple[Dict[str, str], List[Path]]]:
+        """
+        Returns emitted files and imported modules of the module,
+        if the module hasn't been changed since the last build.
+        """
+        if not self.enabled:
+            return None
+        result = self._read(self.directory / 'modules' / f'{self._pathDigest(module)}.json')
+        if result is None or result['key'] != self.moduleKey(text):
+            return None
+        return result['files'], list(map(Path, result['imports']))
+
+    def save(self, module: Path, text: str, files: Dict[str, str], imports: List[Path]):
+        if not self.enabled:
+            return
+        self._write(self.directory / 'modules' / f'{self._pathDigest(module)}.json', {
+            'key': self.moduleKey(text),
+            'files': files,
+            'imports': list(map(str, imports))
+        })
+
+    # SYNTAX TREES
+    # ============
+
+    @staticmethod
+    def treeKey(text: str) -> bytes:
+        return sha256((grammarDigest() + text).encode()).digest()
+
+    def loadTree(self, module: Path, text: str) -> Optional[kiwi.Module]:
+        """
+        Returns the syntax tree of the module, if it has been parsed before
+        with the same grammar and compiler version.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with (self.directory / 'trees' / f'{self._pathDigest(module)}.bin').open('rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        key = self.treeKey(text)
+        if not data.startswith(_treeMagic) or data[len(_treeMagic):len(_treeMagic) + len(key)] != key:
+            return None
+        try:
+            return decodeTree(zlib.decompress(data[len(_treeMagic) + len(key):]))
+        except (zlib.error, ValueError, EOFError, TypeError, IndexError, AttributeError, AssertionError):
+            return None
+
+    def saveTree(self, module: Path, text: str, tree: kiwi.Module):
+        if not self.enabled:
+            return
+        try:
+            data = zlib.compress(encodeTree(tree))
+        except ValueError:
+            return
+        path = self.directory / 'trees' / f'{self._pathDigest(module)}.bin'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('wb') as file:
+            file.write(_treeMagic + self.treeKey(text) + data)
+
+    def clearTrees(self):
+        """
+        It's called, when the grammar is updated.
+        """
+        rmtree(self.directory / 'trees', ignore_errors=True)
+
+    # OUTPUTS
+    # =======
+
+    def loadOutputs(self, output: Path) -> Optional[Dict[str, str]]:
+        """
+        Returns digests of files, which were written into output directory by the last build.
+        """
+        if not self.enabled:
+            return None
+        return self._read(self.directory / 'outputs' / f'{self._pathDigest(output)}.json')
+
+    def saveOutputs(self, output: Path, digests: Dict[str, str]):
+        if not self.enabled:
+            return
+        self._write(self.directory / 'outputs' / f'{self._pathDigest(output)}.json', digests)
@@ -0,0 +1,176 @@
+"""
+This module provides compact output mode.
+It's a link-time pass over contents of all datapack files:
+JSON is minified, and internal names are replaced by short identifiers.
+Every identifier is taken from the hash of the name, so it's the same in every build.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Dict, Set, List, Tuple, Iterable, Optional
+from hashlib import blake2b
+import json
+import re
+
+# Custom libraries
+# ----------------
+
+from components.kiwiOptimizer import generatedResources, rewriteReferences
+from LangApi.prefix import Prefix
+
+Symbols = Dict[str, Dict[str, str]]
+"""
+Every kind of names is mapped to original names by their identifiers.
+"""
+
+_scores = re.compile(r'\b(?:score|players \w+) (\S+) (\S+)(?: (?:[<>]=?|[-+*/%]?=|><) (\S+) (\S+))?')
+"""
+Score holders and objectives of commands, e.g. "execute if score $a x.y < $b x.y".
+"""
+_objectives = re.compile(r'\bscoreboard objectives add (\S+)')
+_components = re.compile(r'"(name|objective|score)": ?"([^"\\]+)"')
+"""
+Score holders and objectives of score text components and predicates.
+"""
+_jsonCommands = re.compile(r'^(.*?\b(?:tellraw \S+|bossbar add \S+) )(.+)$', re.MULTILINE)
+_alphabet = '0123456789abcdefghijklmnopqrstuvwxyz'
+_compilerObjectives = {Prefix.default_scoreboard.toString()}
+"""
+Objectives, which are created by compiler. Objectives of user can be used outside of the datapack,
+so they are never renamed.
+"""
+
+
+def isInternalName(name: str) -> bool:
+    """
+    Names of score holders, which are created by compiler (temporary variables,
+    checks of branches, variables of generated scopes), have a segment, that starts with "$" or "--".
+    """
+    if ':' in name or '/' in name or name[0] in '@#{[':
+        return False
+    return any(part.startswith(('$', '--')) for part in name.split('.'))
+
+
+def _digest(name: str) -> str:
+    value = int.from_bytes(blake2b(name.encode(), digest_size=8).digest(), 'big')
+    result = list()
+    while value:
+        value, digit = divmod(value, len(_alphabet))
+        result.append(_alphabet[digit])
+    return ''.join(result)
+
+
+def shortNames(names: Iterable[str], prefix: str = '', length: int = 3) -> Dict[str, str]:
+    """
+    Every name gets the shortest beginning of its hash, which isn't taken by another name.
+    Names are processed in sorted order, so the result doesn't depend on order of files.
+    """
+    result = dict()
+    taken = set()
+    for name in sorted(names):
+        digest = _digest(name)
+        for size in range(length, len(digest) + 1):
+            if (short := f'{prefix}{digest[:size]}') not in taken:
+                break
+        else:
+            counter = 0
+            while (short := f'{prefix}{digest}{counter}') in taken:
+                counter += 1
+        taken.add(short)
+        result[name] = short
+    return result
+
+
+def minifyJSON(text: str) -> Optional[str]:
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return None
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _minifyCommand(match: re.Match) -> str:
+    if (text := minifyJSON(match[2])) is None:
+        return match[0]
+    return f'{match[1]}{text}'
+
+
+def _split(path: str, content: str) -> List[Tuple[str, str]]:
+    """
+    Splits every command into its arguments before the first JSON string and JSON text,
+    JSON files are JSON text entirely. Names are renamed only in known positions,
+    so text of user is never changed.
+    """
+    if path.endswith('.json'):
+        return [('', content)]
+    return [(command, quote + text) for command, quote, text in
+            (line.partition('"') for line in content.split('\n'))]
+
+
+def _substitute(match: re.Match, kinds: List[Dict[str, str]]) -> str:
+    """
+    Replaces groups of the match by short names, kinds are given in order of groups.
+    """
+    text, offset = match[0], match.start()
+    # Groups are replaced from the end, so positions of previous groups aren't changed
+    for index in reversed(range(len(kinds))):
+        if (name := match[index + 1]) is not None and name in kinds[index]:
+            start, end = match.span(index + 1)
+            text = text[:start - offset] + kinds[index][name] + text[end - offset:]
+    return text
+
+
+def compact(files: Dict[str, str]) -> Symbols:
+    """
+    Minifies JSON files and JSON text of commands, then renames internal score holders,
+    objectives of compiler and generated functions and predicates.
+    Files are changed in place, the symbol map is returned for debugging.
+    """
+    for path, content in files.items():
+        if path.endswith('.json'):
+            files[path] = minifyJSON(content) or content
+        elif path.endswith('.mcfunction'):
+            files[path] = _jsonCommands.sub(_minifyCommand, content)
+
+    players: Set[str] = set()
+    objectives: Set[str] = set()
+    for path, content in files.items():
+        for command, text in _split(path, content):
+            objectives.update(_objectives.findall(command))
+            for match in _scores.finditer(command):
+                players.update(name for name in match.group(1, 3) if name is not None)
+            players.update(name for key, name in _components.findall(text) if key == 'name')
+    players = {name for name in players if isInternalName(name)}
+    objectives = {name for name in objectives if name.split('.')[-1] in _compilerObjectives}
+
+    resources = generatedResources(files)
+    symbols: Symbols = {'players': shortNames(players, '$'), 'objectives': dict(), 'resources': dict()}
+    for kind, values, separator, suffix in [('objectives', objectives, '.', '.'),
+                                            ('resources', set(resources.values()), ':', ':-/')]:
+        for namespace in sorted({name.split(separator)[0] for name in values}):
+            group = shortNames([name for name in values if name.split(separator)[0] == namespace],
+                               f'{namespace}{suffix}')
+            symbols[kind] |= group
+    players, objectives, names = symbols['players'], symbols['objectives'], symbols['resources']
+    components = {'name': players, 'objective': objectives, 'score': objectives}
+
+    def renameCommand(command: str) -> str:
+        command = _scores.sub(lambda x: _substitute(x, [players, objectives, players, objectives]), command)
+        command = _objectives.sub(lambda x: _substitute(x, [objectives]), command)
+        return rewriteReferences(command, lambda x: names.get(x, x))
+
+    def renameText(text: str) -> str:
+        return _components.sub(lambda x: _substitute(x, [dict(), components[x[1]]]), text)
+
+    for path in list(files):
+        content = '\n'.join(renameCommand(command) + renameText(text)
+                             for command, text in _split(path, files.pop(path)))
+        if (resource := resources.get(path)) is not None:
+            parts = path.split('/')
+            path = '/'.join(['data', parts[1], parts[2], *names[resource].split(':')[1].split('/')]) + \
+                '.' + path.rpartition('.')[2]
+        files[path] = content
+    return {kind: dict(sorted((short, name) for name, short in values.items())) for kind, values in symbols.items()}
@@ -8,7 +8,7 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import TYPE_CHECKING, TextIO, List, Any
+from typing import TYPE_CHECKING, List, Dict, Set, Any
 from pathlib import Path
 from shutil import rmtree
 import json
@@ -16,6 +16,13 @@ import json
 # Custom libraries
 # ----------------
 
+from components.kiwiCache import contentDigest
+from components.kiwiCompact import compact
+from components.kiwiOptimizer import deduplicate
+from components.kiwiWriter import Writer, ZipWriter
+from components.kiwiScope import CodeScope
+import components.kiwiColors as colors
+
 if TYPE_CHECKING:
     import compiler
     import LangApi
@@ -63,13 +70,20 @@ class Constructor:
     directories: Directories
     builder: compiler.Builder
 
+    meta: str
+    files: Dict[str, str]
+    """
+    Contents of all module files, paths are relative to output directory.
+    """
+
     def __init__(self, builder: compiler.Builder):
         self.builder = builder
         self.config = builder.configGeneral
         self.attributes = Attributes()
         self.directories = Directories()
+        self.files = dict()
         self.folders()
-        self.files()
+        self.metadata()
 
     def folders(self):
         """
@@ -80,21 +94,12 @@ class Constructor:
             self.directories.bin = path
         else:
             self.directories.bin = Path(self.config['path']) / self.config['output_directory']
-        rmtree(self.directories.bin, ignore_errors=True)
-        self.directories.bin.mkdir(exist_ok=True)
 
         self.directories.data = Path(self.directories.bin / 'data')
-        self.directories.data.mkdir(exist_ok=True)
-
         self.directories.project = Path(self.directories.data /
                                         LangApi.bytecode.convert_var_name(self.config['project_name']))
-        self.directories.project.mkdir(exist_ok=True)
-
         self.directories.functions = Path(self.directories.project / 'functions')
-        self.directories.functions.mkdir(exist_ok=True)
-
         self.directories.predicates = Path(self.directories.project / 'predicates')
-        self.directories.predicates.mkdir(exist_ok=True)
 
         self.attributes.project = list(map(str, self.directories.project.relative_to(
             self.directories.data
@@ -106,9 +111,9 @@ class Constructor:
             self.directories.data
         ).parts))
 
-    def files(self):
+    def metadata(self):
         """
-        Files initialization.
+        Metadata initialization.
         But at the moment, there is only one file.
         """
 
@@ -136,34 +141,105 @@ class Constructor:
                     return 10
             return -1
 
-        with (self.directories.bin / 'pack.mcmeta').open('w+') as file:
-            file.write(json.dumps({
-                "pack": {
-                    "pack_format": get_pack(self.config['mc_version']),
-                    "description": (self.config['description'])
-                }
-            }, indent=4))
+        self.meta = json.dumps({
+            "pack": {
+                "pack_format": get_pack(self.config['mc_version']),
+                "description": (self.config['description'])
+            }
+        }, indent=4)
 
-    def create_file(self, path: Path, to_go: List[str]) -> TextIO:
+    @staticmethod
+    def collect(code: Set[CodeScope]) -> Dict[str, str]:
         """
-        This method takes <path> and <to_go>,
-        concatenates <path> and <to_go> into a single directory,
-        then returns you opened TextIO object.
+        This method converts code scopes of a module into file contents.
         """
-        if len(to_go) == 1:
-            return (path / to_go[0]).open('a')
-        result = path / to_go[0]
-        result.mkdir(parents=True, exist_ok=True)
-        return self.create_file(result, to_go[1:])
+        result = dict()
+        for codeScope in code:
+            for key, commands in codeScope.code.items():
+                path = '/'.join(['data', *codeScope.toPath(key)])
+                result[path] = result.get(path, str()) + '\n'.join(map(lambda x: x.toCode(), commands))
+        return result
+
+    def include(self, files: Dict[str, str]):
+        """
+        This method adds module files to the datapack.
+        """
+        for path, content in files.items():
+            if path in self.files:
+                content = f'{self.files[path]}\n{content}'
+            self.files[path] = content
 
     def build(self):
         """
         Finally, this method is called.
         And the whole datapack is built into one
         powerful structure.
+        Generated files with the same content are merged into one file.
+        In compact mode, names are shortened, and the symbol map is written near output directory.
+        Only files, whose content has been changed since the last build, are written,
+        they are collected first and written at once by the writer.
+        """
+        if self.config['deduplicate']:
+            removed = deduplicate(self.files)
+            if self.config['report']:
+                print(f'{colors.Yellow}Linker removed {removed} duplicate files{colors.Default}')
+
+        path = self.directories.bin.with_name(f'{self.directories.bin.name}.symbols.json')
+        if self.config['compact']:
+            symbols = compact(self.files)
+            Writer.writeFiles([(str(path), json.dumps(symbols, indent=4))])
+        else:
+            # Symbols of previous compact build don't match new files
+            path.unlink(missing_ok=True)
+
+        files = {'pack.mcmeta': self.meta} | self.files
+        if self.config['zip']:
+            self.buildArchive(files)
+            return
+
+        previous = self.builder.cache.loadOutputs(self.directories.bin)
+        if previous is None:
+            previous = dict()
+            rmtree(self.directories.bin, ignore_errors=True)
+
+        digests = dict()
+        changed = dict()
+        for path, content in files.items():
+            digests[path] = contentDigest(content)
+            if previous.get(path) == digests[path] and (self.directories.bin / path).exists():
+                continue
+            changed[path] = content
+        Writer(self.directories.bin).write(changed)
+
+        stale = [self.directories.bin / path for path in previous.keys() - digests.keys()]
+        for path in stale:
+            path.unlink(missing_ok=True)
+        self.removeEmptyDirectories({path.parent for path in stale})
+        self.builder.cache.saveOutputs(self.directories.bin, digests)
+
+    def removeEmptyDirectories(self, directories: Set[Path]):
+        """
+        This method removes directories of stale files, which became empty,
+        and their empty parents up to the output directory.
+        """
+        # Deeper directories are removed first, so their parents can become empty
+        for directory in sorted(directories, key=lambda x: len(x.parts), reverse=True):
+            while directory != self.directories.bin and directory.is_relative_to(self.directories.bin):
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+
+    def buildArchive(self, files: Dict[str, str]):
+        """
+        This method builds the datapack into zip archive near output directory,
+        which is the same for the same files.
+        The archive is written again only if any file has been changed since the last build.
         """
-        for codeScope in self.builder.api.code:
-            for key, code in codeScope.code.items():
-                self.create_file(self.directories.data, codeScope.toPath(key)).write(
-                    '\n'.join(map(lambda x: x.toCode(), code))
-                )
+        archive = self.directories.bin.with_name(f'{self.directories.bin.name}.zip')
+        digests = {path: contentDigest(content) for path, content in files.items()}
+        if self.builder.cache.loadOutputs(archive) == digests and archive.exists():
+            return
+        ZipWriter(archive).write(files)
+        self.builder.cache.saveOutputs(archive, digests)
@@ -0,0 +1,469 @@
+"""
+This module provides the offline interpreter of built datapacks.
+It executes the subset of commands, which are emitted by compiler,
+and counts executed commands of every function.
+It's used to measure runtime cost of generated code without Minecraft server.
+
+Usage:
+    python -m components.kiwiInterpreter <path to bin> [function ...]
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Dict, List, Optional, Iterator, Any
+from dataclasses import dataclass, field
+from argparse import ArgumentParser
+from pathlib import Path
+import json
+
+# Custom libraries
+# ----------------
+
+import components.kiwiColors as colors
+
+
+class InterpreterError(Exception):
+    """
+    It's raised, when the command can't be executed by interpreter.
+    """
+
+
+_int_min = -2 ** 31
+_max_command_chain = 65536
+
+
+def _wrap(value: int) -> int:
+    """
+    Returns the value wrapped into 32-bit signed integer, as Minecraft does.
+    """
+    return (value - _int_min) % 2 ** 32 + _int_min
+
+
+def _literal(text: str) -> int:
+    """
+    Parses integer argument of command.
+    Minecraft doesn't wrap it, the whole command is invalid, if it's out of 32-bit range.
+    """
+    if not _int_min <= (value := int(text)) < -_int_min:
+        raise InterpreterError(f'Invalid command, integer "{text}" is out of range')
+    return value
+
+
+def _divide(left: int, right: int) -> int:
+    # Minecraft leaves the score unchanged
+    if right == 0:
+        return left
+    return _wrap(left // right)
+
+
+def _modulo(left: int, right: int) -> int:
+    if right == 0:
+        return left
+    return left % right
+
+
+_operations = {
+    '=': lambda left, right: right,
+    '+=': lambda left, right: _wrap(left + right),
+    '-=': lambda left, right: _wrap(left - right),
+    '*=': lambda left, right: _wrap(left * right),
+    '/=': _divide,
+    '%=': _modulo,
+    '<': min,
+    '>': max,
+}
+
+_comparisons = {
+    '<': lambda left, right: left < right,
+    '<=': lambda left, right: left <= right,
+    '=': lambda left, right: left == right,
+    '>=': lambda left, right: left >= right,
+    '>': lambda left, right: left > right,
+}
+
+
+def parseRange(text: str) -> tuple[Optional[int], Optional[int]]:
+    """
+    Parses integer range like "5", "1..", "..3" or "1..3".
+    """
+    if '..' not in text:
+        return int(text), int(text)
+    low, high = text.split('..')
+    return int(low) if low else None, int(high) if high else None
+
+
+def splitResource(path: str, folder: str) -> Optional[str]:
+    """
+    Converts the path of datapack file into resource location.
+    e.g:
+    "data/project/functions/foo/bar.mcfunction" -> "project:foo/bar"
+    """
+    parts = path.split('/')
+    if len(parts) < 4 or parts[0] != 'data' or parts[2] != folder:
+        return None
+    name = '/'.join(parts[3:])
+    return f'{parts[1]}:{name[:name.rfind(".")]}'
+
+
+def resourceName(name: str) -> str:
+    return name if ':' in name else f'minecraft:{name}'
+
+
+@dataclass
+class Report:
+    """
+    This class is used to store statistics of execution.
+    """
+    commands: Dict[str, int] = field(default_factory=dict)
+    """
+    Count of executed commands of every function, nested calls are not included.
+    """
+    calls: Dict[str, int] = field(default_factory=dict)
+    output: List[str] = field(default_factory=list)
+    """
+    Text of all executed tellraw commands.
+    """
+    unsupported: Dict[str, int] = field(default_factory=dict)
+    """
+    Commands, which are skipped by interpreter, with count of their executions.
+    """
+    missing: Dict[str, int] = field(default_factory=dict)
+    """
+    Functions, which are called, but don't exist in datapack, with count of their calls.
+    """
+
+    @property
+    def total(self) -> int:
+        return sum(self.commands.values())
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'commands': dict(sorted(self.commands.items())),
+            'calls': dict(sorted(self.calls.items())),
+            'output': self.output,
+            'unsupported': self.unsupported,
+            'missing': self.missing
+        }
+
+
+class Interpreter:
+    """
+    The main task of this class is
+    - execute functions of datapack and count executed commands
+    """
+
+    functions: Dict[str, List[str]]
+    predicates: Dict[str, Any]
+    tags: Dict[str, List[str]]
+
+    objectives: Dict[str, Dict[str, int]]
+    bossbars: Dict[str, str]
+    report: Report
+
+    def __init__(self, files: Dict[str, str]):
+        """
+        :param files:
+        Contents of datapack files, paths are relative to output directory.
+        """
+        self.functions = dict()
+        self.predicates = dict()
+        self.tags = dict()
+        for path, content in files.items():
+            if (name := splitResource(path, 'functions')) is not None and path.endswith('.mcfunction'):
+                self.functions[name] = [
+                    line.strip() for line in content.splitlines()
+                    if line.strip() and not line.lstrip().startswith('#')
+                ]
+            elif (name := splitResource(path, 'predicates')) is not None:
+                self.predicates[name] = json.loads(content)
+            elif (name := splitResource(path, 'tags')) is not None and name.split(':')[1].startswith('functions/'):
+                namespace, name = name.split(':')
+                self.tags[f'{namespace}:{name.removeprefix("functions/")}'] = [
+                    resourceName(value) for value in json.loads(content).get('values', list())
+                ]
+        self.objectives = dict()
+        self.bossbars = dict()
+        self.report = Report()
+
+    @classmethod
+    def fromDirectory(cls, directory: Path) -> Interpreter:
+        """
+        Reads all files of built datapack.
+        """
+        files = dict()
+        for path in directory.rglob('*'):
+            if path.is_file() and path.suffix in {'.mcfunction', '.json'}:
+                files[path.relative_to(directory).as_posix()] = path.read_text()
+        return cls(files)
+
+    def entries(self) -> List[str]:
+        """
+        Returns functions, which are run, when the datapack is loaded.
+        If there is no load tag, main functions of all modules are returned.
+        """
+        if 'minecraft:load' in self.tags:
+            return self.tags['minecraft:load']
+        return sorted(name for name in self.functions if name.split(':')[1].endswith('--main--'))
+
+    # Scores
+    # ------
+
+    def getScore(self, name: str, objective: str) -> Optional[int]:
+        if objective not in self.objectives:
+            raise InterpreterError(f'Unknown scoreboard objective "{objective}"')
+        return self.objectives[objective].get(name)
+
+    def setScore(self, name: str, objective: str, value: Optional[int]):
+        if objective not in self.objectives:
+            raise InterpreterError(f'Unknown scoreboard objective "{objective}"')
+        if value is None:
+            self.objectives[objective].pop(name, None)
+        else:
+            self.objectives[objective][name] = _wrap(value)
+
+    # Predicates
+    # ----------
+
+    def number(self, value: Any) -> int:
+        """
+        Returns the value of number provider.
+        """
+        if isinstance(value, int | float):
+            return int(value)
+        match value.get('type'):
+            case 'minecraft:constant':
+                return int(value['value'])
+            case 'minecraft:score':
+                target = value.get('target')
+                if not isinstance(target, dict) or target.get('type') != 'minecraft:fixed':
+                    raise InterpreterError(f'Unsupported score target {target}')
+                score = self.getScore(target['name'], value['score'])
+                return 0 if score is None else score
+        raise InterpreterError(f'Unsupported number provider {value}')
+
+    def checkPredicate(self, predicate: Any) -> bool:
+        if isinstance(predicate, list):
+            return all(map(self.checkPredicate, predicate))
+        match predicate.get('condition'):
+            case 'minecraft:value_check':
+                value = self.number(predicate['value'])
+                bounds = predicate['range']
+                if not isinstance(bounds, dict) or 'type' in bounds:
+                    return value == self.number(bounds)
+                if 'min' in bounds and value < self.number(bounds['min']):
+                    return False
+                if 'max' in bounds and value > self.number(bounds['max']):
+                    return False
+                return True
+            case 'minecraft:inverted':
+                return not self.checkPredicate(predicate['term'])
+            case 'minecraft:alternative' | 'minecraft:any_of':
+                return any(map(self.checkPredicate, predicate['terms']))
+            case 'minecraft:all_of':
+                return all(map(self.checkPredicate, predicate['terms']))
+            case 'minecraft:reference':
+                return self.checkPredicate(self.predicates[resourceName(predicate['name'])])
+        raise InterpreterError(f'Unsupported predicate condition "{predicate.get("condition")}"')
+
+    # Text components
+    # ---------------
+
+    def render(self, component: Any) -> str:
+        """
+        Returns plain text of JSON text component.
+        """
+        if isinstance(component, str):
+            return component
+        if isinstance(component, int | float | bool):
+            return str(component).lower()
+        if isinstance(component, list):
+            return ''.join(map(self.render, component))
+        result = str()
+        if 'text' in component:
+            result = str(component['text'])
+        elif 'score' in component:
+            score = self.getScore(component['score']['name'], component['score']['objective'])
+            result = str() if score is None else str(score)
+        elif 'translate' in component:
+            result = component['translate']
+        return result + ''.join(map(self.render, component.get('extra', list())))
+
+    # Commands
+    # --------
+
+    def scoreboard(self, args: List[str]):
+        match args:
+            case ['objectives', 'add', objective, _, *_]:
+                self.objectives.setdefault(objective, dict())
+            case ['objectives', 'remove', objective]:
+                self.objectives.pop(objective, None)
+            case ['objectives', 'setdisplay', *_]:
+                pass
+            case ['players', 'set', name, objective, value]:
+                self.setScore(name, objective, _literal(value))
+            case ['players', 'add', name, objective, value]:
+                self.setScore(name, objective, (self.getScore(name, objective) or 0) + _literal(value))
+            case ['players', 'remove', name, objective, value]:
+                self.setScore(name, objective, (self.getScore(name, objective) or 0) - _literal(value))
+            case ['players', 'reset', name, objective]:
+                self.setScore(name, objective, None)
+            case ['players', 'operation', name, objective, operation, other, other_objective]:
+                if operation == '><':
+                    left, right = self.getScore(name, objective), self.getScore(other, other_objective)
+                    self.setScore(name, objective, right)
+                    self.setScore(other, other_objective, left)
+                    return
+                if operation not in _operations:
+                    raise InterpreterError(f'Unsupported operation "{operation}"')
+                left = self.getScore(name, objective) or 0
+                right = self.getScore(other, other_objective) or 0
+                self.setScore(name, objective, _operations[operation](left, right))
+            case _:
+                raise InterpreterError(f'Unsupported command "scoreboard {" ".join(args)}"')
+
+    def condition(self, args: List[str]) -> tuple[bool, List[str]]:
+        """
+        Checks the first condition of execute command,
+        and returns its result with the rest of arguments.
+        """
+        match args:
+            case ['score', name, objective, 'matches', bounds, *rest]:
+                score = self.getScore(name, objective)
+                low, high = parseRange(bounds)
+                return score is not None and (low is None or low <= score) and (high is None or score <= high), rest
+            case ['score', name, objective, op, other, other_objective, *rest] if op in _comparisons:
+                left, right = self.getScore(name, objective), self.getScore(other, other_objective)
+                return left is not None and right is not None and _comparisons[op](left, right), rest
+            case ['predicate', name, *rest]:
+                if (predicate := self.predicates.get(resourceName(name))) is None:
+                    raise InterpreterError(f'Unknown predicate "{name}"')
+                return self.checkPredicate(predicate), rest
+        raise InterpreterError(f'Unsupported condition "{" ".join(args)}"')
+
+    def execute(self, command: str) -> Optional[str]:
+        """
+        Executes one command.
+        If the command calls a function, the name of this function is returned.
+        """
+        args = command.split(' ')
+        match args[0]:
+            case 'scoreboard':
+                self.scoreboard(args[1:])
+            case 'function' if args[1].startswith('#'):
+                return f'#{resourceName(args[1][1:])}'
+            case 'function':
+                return resourceName(args[1])
+            case 'execute':
+                args = args[1:]
+                while args:
+                    match args[0]:
+                        case 'if' | 'unless':
+                            result, rest = self.condition(args[1:])
+                            if result != (args[0] == 'if'):
+                                return None
+                            args = rest
+                        case 'run':
+                            return self.execute(' '.join(args[1:]))
+                        case _:
+                            raise InterpreterError(f'Unsupported subcommand "execute {args[0]}"')
+            case 'tellraw':
+                _, _, text = command.split(' ', 2)
+                try:
+                    component = json.loads(text)
+                except ValueError:
+                    component = text
+                self.report.output.append(self.render(component))
+            case 'bossbar' if args[1:2] == ['add']:
+                self.bossbars[args[2]] = ' '.join(args[3:])
+            case _:
+                self.report.unsupported[args[0]] = self.report.unsupported.get(args[0], 0) + 1
+        return None
+
+    def call(self, name: str, maxCommands: int = _max_command_chain) -> Report:
+        """
+        Runs the function and all functions, which are called by it.
+        Like in Minecraft, functions are executed depth first,
+        and execution stops, when count of commands reaches the limit.
+        """
+        stack: List[tuple[str, Iterator[str]]] = list()
+        executed = 0
+
+        def push(function: str):
+            if function.startswith('#'):
+                for value in reversed(self.tags.get(function[1:], list())):
+                    push(value)
+                return
+            if function not in self.functions:
+                self.report.missing[function] = self.report.missing.get(function, 0) + 1
+                return
+            self.report.calls[function] = self.report.calls.get(function, 0) + 1
+            stack.append((function, iter(self.functions[function])))
+
+        if name not in self.functions and not name.startswith('#'):
+            raise InterpreterError(f'Unknown function "{name}"')
+        push(name)
+        while stack and executed < maxCommands:
+            function, commands = stack[-1]
+            if (command := next(commands, None)) is None:
+                stack.pop(-1)
+                continue
+            executed += 1
+            self.report.commands[function] = self.report.commands.get(function, 0) + 1
+            try:
+                called = self.execute(command)
+            except (InterpreterError, KeyError, ValueError, IndexError) as e:
+                raise InterpreterError(f'{e}\n  in function "{function}": {command}') from e
+            if called is not None:
+                push(called)
+        return self.report
+
+    def run(self, entries: List[str] = None, ticks: int = 0) -> Report:
+        """
+        Runs entry functions once, then runs functions of tick tag given times.
+        """
+        for name in self.entries() if entries is None else entries:
+            self.call(resourceName(name))
+        for _ in range(ticks):
+            for name in self.tags.get('minecraft:tick', list()):
+                self.call(name)
+        return self.report
+
+
+def main(arguments: List[str] = None):
+    argparser = ArgumentParser(description='Kiwi datapack interpreter')
+    argparser.add_argument('path', type=str, help='Path to built datapack')
+    argparser.add_argument('functions', nargs='*', type=str,
+                           help='Functions to run, load tag or main functions are run by default')
+    argparser.add_argument('--ticks', default=0, type=int,
+                           help='How many times functions of tick tag are run')
+    argparser.add_argument('--json', default=False, action='store_true',
+                           help='Prints report in JSON format')
+    options = argparser.parse_args(arguments)
+
+    interpreter = Interpreter.fromDirectory(Path(options.path))
+    try:
+        report = interpreter.run(options.functions or None, options.ticks)
+    except InterpreterError as e:
+        print(f'{colors.Red}Kiwi Interpreter Error:\n{e}{colors.Default}')
+        exit(1)
+
+    if options.json:
+        print(json.dumps(report.toDict(), indent=4))
+        return
+    for line in report.output:
+        print(line)
+    print(f'{colors.Yellow}Executed {report.total} commands{colors.Default}')
+    for name, count in sorted(report.commands.items(), key=lambda x: (-x[1], x[0])):
+        print(f'  {name}: {count} commands in {report.calls[name]} calls')
+    for name, count in report.unsupported.items():
+        print(f'{colors.Red}  Skipped {count} unsupported "{name}" commands{colors.Default}')
+    for name, count in report.missing.items():
+        print(f'{colors.Red}  Skipped {count} calls of missing function "{name}"{colors.Default}')
+
+
+if __name__ == '__main__':
+    main()
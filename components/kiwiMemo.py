@@ -0,0 +1,100 @@
+"""
+This module provides memo cache of parser.
+Packrat parser keeps result of every rule at every position,
+so the cache grows with size of module times count of rules.
+The cache of this module can forget entries behind top-level statements,
+and counts hits, misses and backtracking of every rule.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Dict, List, Tuple, Any
+
+Key = Tuple[int, str, tuple]
+Statistics = Dict[str, List[int]]
+"""
+Every rule is mapped to count of hits, misses and backtracking.
+"""
+
+
+class MemoCache(dict):
+    """
+    The main task of this class is
+    - count memo hits, misses and backtracking of every parser rule
+    - evict entries behind the last committed statement boundary, if it's bounded
+
+    Backtracking is a failed attempt of the rule,
+    after that the parser returns to the mark and tries the next alternative.
+    """
+
+    bounded: bool
+    rules: Statistics
+    boundary: int
+    """
+    Mark of the statement before the last committed one,
+    entries before this mark are evicted.
+    """
+    committed: int
+    marks: Dict[int, List[Key]]
+
+    def __init__(self, bounded: bool = False):
+        super().__init__()
+        self.bounded = bounded
+        self.rules = dict()
+        self.boundary = 0
+        self.committed = 0
+        self.marks = dict()
+
+    def __getitem__(self, key: Key) -> Any:
+        # Parser gets items only if they exist, so every call is a hit
+        self.rules[key[1]][0] += 1
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: Key, value: Tuple[Any, int]):
+        previous = super().get(key)
+        if previous is None:
+            counters = self.rules.get(key[1])
+            if counters is None:
+                counters = self.rules[key[1]] = [0, 0, 0]
+            counters[1] += 1
+            if value[0] is None:
+                counters[2] += 1
+            if self.bounded:
+                self.marks.setdefault(key[0], []).append(key)
+        elif previous[0] is None and value[0] is not None:
+            # Left-recursive rule replaces the failure, which is primed at the start
+            self.rules[key[1]][2] -= 1
+        super().__setitem__(key, value)
+
+    def commit(self, mark: int):
+        """
+        Marks the end of top-level statement, the parser never returns before it.
+        Entries of the previous statement are evicted only at the next boundary,
+        because the memo entry of committed statement itself is stored after this call.
+        """
+        if not self.bounded or mark <= self.committed:
+            return
+        for position in range(self.boundary, self.committed):
+            for key in self.marks.pop(position, ()):
+                self.pop(key, None)
+        self.boundary, self.committed = self.committed, mark
+
+    @property
+    def hits(self) -> int:
+        return sum(counters[0] for counters in self.rules.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(counters[1] for counters in self.rules.values())
+
+
+def mergeStatistics(target: Statistics, source: Statistics):
+    for rule, counters in source.items():
+        if (previous := target.get(rule)) is None:
+            target[rule] = list(counters)
+            continue
+        for index, value in enumerate(counters):
+            previous[index] += value
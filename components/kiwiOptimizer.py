@@ -0,0 +1,629 @@
+"""
+This module contains optimization passes over emitted commands.
+They are called after API visiting, right before files are collected.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Callable, Dict, List, Optional, Set, Iterable, Iterator, Any
+from dataclasses import replace
+from bisect import bisect_left, bisect_right, insort
+import re
+
+# Custom libraries
+# ----------------
+
+from components.kiwiScope import CodeScope
+import LangApi.bytecode as bytecode
+
+
+# Score references
+# ----------------
+
+Access = tuple[str, bool]
+"""
+Converted name of score holder and True, if the holder is written, otherwise it's read.
+"""
+
+_writes = {
+    bytecode.ScoreboardPlayersSet: 'name',
+    bytecode.ScoreboardPlayersOpAss: 'name',
+    bytecode.ScoreboardPlayersReset: 'name',
+}
+
+_updates = {
+    bytecode.ScoreboardPlayersAdd: 'name',
+    bytecode.ScoreboardPlayersRemove: 'name',
+    bytecode.ScoreboardPlayersOpIAdd: 'name',
+    bytecode.ScoreboardPlayersOpISub: 'name',
+    bytecode.ScoreboardPlayersOpIMul: 'name',
+    bytecode.ScoreboardPlayersOpIDiv: 'name',
+    bytecode.ScoreboardPlayersOpIMod: 'name',
+}
+
+_reads = {
+    bytecode.ScoreboardPlayersOpAss: ['other_name'],
+    bytecode.ScoreboardPlayersOpIAdd: ['other_name'],
+    bytecode.ScoreboardPlayersOpISub: ['other_name'],
+    bytecode.ScoreboardPlayersOpIMul: ['other_name'],
+    bytecode.ScoreboardPlayersOpIDiv: ['other_name'],
+    bytecode.ScoreboardPlayersOpIMod: ['other_name'],
+    bytecode.StepIfScoreMatch: ['name'],
+    bytecode.StepUnlessScoreMatch: ['name'],
+    bytecode.StepIfScoreCompare: ['name', 'other_name'],
+    bytecode.StepUnlessScoreCompare: ['name', 'other_name'],
+}
+
+_json = {
+    bytecode.Tellraw: 'text',
+    bytecode.RawJSON: 'json',
+    bytecode.BossbarAdd: 'text',
+}
+
+_neutral = (
+    bytecode.ScoreboardObjectiveCreate,
+    bytecode.ScoreboardObjectiveSetDisplay,
+    bytecode.ScoreboardObjectiveRemove,
+    bytecode.FunctionDirectCall,
+    bytecode.StepIfPredicate,
+)
+
+
+def _jsonNames(value: Any) -> List[str]:
+    """
+    Returns names of score holders, which are read by text component or predicate.
+    """
+    result = list()
+    if isinstance(value, list):
+        for item in value:
+            result.extend(_jsonNames(item))
+    if not isinstance(value, dict):
+        return result
+    if isinstance(score := value.get('score'), dict) and isinstance(score.get('name'), str):
+        result.append(score['name'])
+    if value.get('type') == 'minecraft:fixed' and isinstance(value.get('name'), str):
+        result.append(value['name'])
+    for item in value.values():
+        result.extend(_jsonNames(item))
+    return result
+
+
+def _jsonRename(value: Any, names: Dict[str, str]) -> Any:
+    if isinstance(value, list):
+        return [_jsonRename(item, names) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {key: _jsonRename(item, names) for key, item in value.items()}
+    if isinstance(score := result.get('score'), dict) and score.get('name') in names:
+        result['score'] = score | {'name': names[score['name']]}
+    if result.get('type') == 'minecraft:fixed' and result.get('name') in names:
+        result['name'] = names[result['name']]
+    return result
+
+
+def accesses(command: bytecode.CodeType) -> Optional[List[Access]]:
+    """
+    Returns score holders, which are read or written by the command, in order of execution.
+    If the command is unknown, None is returned.
+    """
+    kind = type(command)
+    if isinstance(command, _neutral):
+        return list()
+    if isinstance(command, bytecode.Execute):
+        result = list()
+        for step in command.steps:
+            if (value := accesses(step)) is None:
+                return None
+            result.extend(value)
+        return result
+    if isinstance(command, bytecode.StepRun):
+        if (value := accesses(command.step)) is None:
+            return None
+        # Step is not always run, so the old value can survive
+        return [(name, False) for name, _ in value] + value
+    if kind in _json:
+        return [(name, False) for name in _jsonNames(getattr(command, _json[kind]))]
+    if kind not in _writes | _updates | _reads:
+        return None
+    result = list()
+    for attribute in _reads.get(kind, list()):
+        result.append((bytecode.convert_var_name(getattr(command, attribute)), False))
+    if kind in _updates:
+        result.append((bytecode.convert_var_name(getattr(command, _updates[kind])), False))
+        result.append((bytecode.convert_var_name(getattr(command, _updates[kind])), True))
+    if kind in _writes:
+        result.append((bytecode.convert_var_name(getattr(command, _writes[kind])), True))
+    return result
+
+
+def rename(command: bytecode.CodeType, names: Dict[str, str]) -> bytecode.CodeType:
+    """
+    Returns the command, which uses new names of score holders.
+    Names are given in converted form.
+    """
+    kind = type(command)
+    if isinstance(command, bytecode.Execute):
+        return replace(command, steps=[rename(step, names) for step in command.steps])
+    if isinstance(command, bytecode.StepRun):
+        return replace(command, step=rename(command.step, names))
+    if kind in _json:
+        return replace(command, **{_json[kind]: _jsonRename(getattr(command, _json[kind]), names)})
+    changes = dict()
+    for attribute in {*_reads.get(kind, list()), _writes.get(kind), _updates.get(kind)} - {None}:
+        if (name := bytecode.convert_var_name(getattr(command, attribute))) in names:
+            changes[attribute] = names[name]
+    return replace(command, **changes) if changes else command
+
+
+# Temporary variables
+# -------------------
+
+_temporary = re.compile(r'[^\s"]*\$temp--\d+')
+
+
+def isTemporary(name: str) -> bool:
+    return name.rsplit('.', 1)[-1].startswith('$temp--')
+
+
+def pinnedTemporaries(functions: List[List[bytecode.CodeType]]) -> Set[str]:
+    """
+    Returns temporary variables, which are shared by several functions,
+    or which value comes from outside. They can't be renamed.
+    """
+    files: Dict[str, int] = dict()
+    pinned: Set[str] = set()
+    for commands in functions:
+        seen = set()
+        for command in commands:
+            if (value := accesses(command)) is None:
+                names = set(_temporary.findall(command.toCode()))
+                seen |= names
+                pinned |= names
+                continue
+            for name, isWritten in value:
+                if not isTemporary(name):
+                    continue
+                if name not in seen and not isWritten:
+                    pinned.add(name)
+                seen.add(name)
+        for name in seen:
+            files[name] = files.get(name, 0) + 1
+    return pinned | {name for name, count in files.items() if count > 1}
+
+
+def allocateTemporaries(code: Set[CodeScope]) -> int:
+    """
+    Temporary variables, which live only in one function, are recycled:
+    their live ranges are found, and then every variable reuses
+    the name of another one, which is already dead (linear scan).
+    Returns the number of temporary variables, which were removed.
+    """
+    functions = [commands for scope in code for commands in scope.code.values()]
+    pinned = pinnedTemporaries(functions)
+
+    removed = 0
+    for commands in functions:
+        ranges: Dict[str, List[int]] = dict()
+        for index, command in enumerate(commands):
+            for name, _ in accesses(command) or list():
+                if isTemporary(name) and name not in pinned:
+                    ranges.setdefault(name, [index, index])[1] = index
+        if len(ranges) < 2:
+            continue
+
+        slots: List[str] = list()
+        ends: List[int] = list()
+        names: Dict[str, str] = dict()
+        order = sorted(ranges, key=lambda x: ranges[x][0])
+        for name in order:
+            start, end = ranges[name]
+            for slot, slotEnd in enumerate(ends):
+                if slotEnd <= start:
+                    break
+            else:
+                slot = len(slots)
+                slots.append(order[slot])
+                ends.append(end)
+            ends[slot] = end
+            if slots[slot] != name:
+                names[name] = slots[slot]
+        removed += len(ranges) - len(slots)
+        if names:
+            commands[:] = [rename(command, names) for command in commands]
+    return removed
+
+
+# Peephole optimizer
+# ------------------
+
+def _wrap(value: int) -> int:
+    """
+    Returns the value wrapped into 32-bit signed integer, as Minecraft does for add and remove.
+    Literal of set command out of this range isn't valid.
+    """
+    return (value + 2 ** 31) % 2 ** 32 - 2 ** 31
+
+
+def _isCopy(command: bytecode.CodeType) -> bool:
+    return isinstance(command, bytecode.ScoreboardPlayersOpAss) and \
+        bytecode.convert_var_name(command.scoreboard) == bytecode.convert_var_name(command.other_scoreboard)
+
+
+def _isSelfAssignment(command: bytecode.CodeType) -> bool:
+    return _isCopy(command) and \
+        bytecode.convert_var_name(command.name) == bytecode.convert_var_name(command.other_name)
+
+
+def _isBarrier(command: bytecode.CodeType, value: Optional[List[Access]]) -> bool:
+    """
+    Commands, which can run another function or are unknown,
+    so any score holder can be read there.
+    Value is the result of accesses of the command.
+    """
+    return isinstance(command, bytecode.FunctionDirectCall | bytecode.Execute) or value is None
+
+
+def _fuseSet(first: bytecode.CodeType, second: bytecode.CodeType) -> Optional[bytecode.CodeType]:
+    """
+    Fuses two commands, if the first one sets the holder to constant.
+    """
+    if not isinstance(first, bytecode.ScoreboardPlayersSet):
+        return None
+    key = bytecode.convert_var_name(first.name), bytecode.convert_var_name(first.scoreboard)
+    if not isinstance(second, bytecode.ScoreboardPlayersSet | bytecode.ScoreboardPlayersAdd |
+                      bytecode.ScoreboardPlayersRemove | bytecode.ScoreboardPlayersReset):
+        return None
+    if (bytecode.convert_var_name(second.name), bytecode.convert_var_name(second.scoreboard)) != key:
+        return None
+    match second:
+        case bytecode.ScoreboardPlayersAdd():
+            return replace(first, value=str(_wrap(int(first.value) + int(second.value))))
+        case bytecode.ScoreboardPlayersRemove():
+            return replace(first, value=str(_wrap(int(first.value) - int(second.value))))
+    return second
+
+
+class _Positions:
+    """
+    The main task of this class is
+    - keep positions of commands, which access every score holder, during one pass of peephole optimizer
+
+    Removed commands are replaced by None, so positions aren't shifted during the pass.
+    Holder, which is replaced by another one, becomes its alias, and their positions are merged.
+    Commands are renamed only, when they are visited, or at the end of the pass,
+    so long chains of copies are not renamed again and again.
+    """
+
+    commands: List[Optional[bytecode.CodeType]]
+    names: List[Set[str]]
+    """
+    Holders of every command, they can be aliases.
+    """
+    positions: Dict[str, List[int]]
+    aliases: Dict[str, str]
+    barriers: List[int]
+    """
+    Count of barriers before every position.
+    Removed and renamed commands are never barriers, so it's not updated.
+    """
+
+    def __init__(self, commands: List[bytecode.CodeType]):
+        self.commands = commands
+        self.names = list()
+        self.positions = dict()
+        self.aliases = dict()
+        self.barriers = [0]
+        for position, command in enumerate(commands):
+            value = accesses(command)
+            self.names.append({name for name, _ in value or list()})
+            for name in self.names[-1]:
+                self.positions.setdefault(name, list()).append(position)
+            self.barriers.append(self.barriers[-1] + _isBarrier(command, value))
+
+    def find(self, name: str) -> str:
+        root = name
+        while root in self.aliases:
+            root = self.aliases[root]
+        # Every visited alias points to the root, so next walks are short
+        while name != root:
+            self.aliases[name], name = root, self.aliases[name]
+        return root
+
+    def merge(self, name: str, target: str):
+        """
+        Replaces the holder by the target.
+        """
+        self.aliases[name] = target
+        positions = self.positions.pop(name, list())
+        targetPositions = self.positions.get(target, list())
+        if len(positions) > len(targetPositions):
+            positions, targetPositions = targetPositions, positions
+        for position in positions:
+            insort(targetPositions, position)
+        self.positions[target] = targetPositions
+
+    def set(self, position: int, command: Optional[bytecode.CodeType]):
+        """
+        Replaces the command, None removes it.
+        """
+        names = set() if command is None else {name for name, _ in accesses(command) or list()}
+        for name in names - self.names[position]:
+            insort(self.positions.setdefault(self.find(name), list()), position)
+        self.names[position] = names
+        self.commands[position] = command
+
+    def resolve(self, position: int) -> bytecode.CodeType:
+        """
+        Renames aliases of the command and returns it.
+        """
+        command = self.commands[position]
+        names = {name: self.find(name) for name in self.names[position] if name in self.aliases}
+        if names:
+            command = rename(command, names)
+            self.set(position, command)
+        return command
+
+    def between(self, name: str, low: int, high: int) -> Iterator[int]:
+        """
+        Returns positions of commands, which access the holder, between low and high (both excluded).
+        """
+        name = self.find(name)
+        positions = self.positions.get(name, list())
+        for index in range(bisect_right(positions, low), bisect_left(positions, high)):
+            if any(self.find(other) == name for other in self.names[positions[index]]):
+                yield positions[index]
+
+    def accessed(self, name: str, low: int, high: int) -> bool:
+        return next(self.between(name, low, high), None) is not None
+
+    def hasBarrier(self, low: int, high: int) -> bool:
+        return high - low > 1 and self.barriers[high] - self.barriers[low + 1] > 0
+
+    def following(self, position: int) -> int:
+        """
+        Returns position of the next command, which isn't removed, or length of commands.
+        """
+        position += 1
+        while position < len(self.commands) and self.commands[position] is None:
+            position += 1
+        return position
+
+
+def _coalesceBackward(state: _Positions, index: int, pinned: Set[str]) -> bool:
+    """
+    <temp> = ...; ...; <target> = <temp>
+    The temporary variable is replaced by the target, and the last copy is removed.
+    """
+    copy = state.commands[index]
+    temp, target = bytecode.convert_var_name(copy.other_name), bytecode.convert_var_name(copy.name)
+    if not isTemporary(temp) or temp in pinned:
+        return False
+    if state.accessed(temp, index, len(state.commands)):
+        return False
+    start = next(state.between(temp, -1, index), index)
+    if start == index:
+        return False
+    if state.hasBarrier(start, index) or state.accessed(target, start, index):
+        return False
+    state.set(index, None)
+    state.merge(temp, target)
+    return True
+
+
+def _coalesceForward(state: _Positions, index: int, pinned: Set[str]) -> bool:
+    """
+    <temp> = <source>; ...
+    If the source is temporary variable, which is dead after the copy,
+    and the temp is written here first time, the temp is replaced by the source.
+    """
+    copy = state.commands[index]
+    temp, source = bytecode.convert_var_name(copy.name), bytecode.convert_var_name(copy.other_name)
+    if not (isTemporary(temp) and isTemporary(source)) or {temp, source} & pinned:
+        return False
+    if state.accessed(temp, -1, index) or state.accessed(source, index, len(state.commands)):
+        return False
+    state.set(index, None)
+    state.merge(temp, source)
+    return True
+
+
+def optimizeFunction(commands: List[bytecode.CodeType], pinned: Set[str]):
+    """
+    Applies peephole rules to commands of one function, until nothing is changed.
+    Positions of score holders are found once per pass, so every rule is checked
+    without scanning the whole function.
+    """
+    changed = True
+    while changed:
+        changed = False
+        state = _Positions(commands)
+        index = state.following(-1)
+        while index < len(commands):
+            command = state.resolve(index)
+            if _isSelfAssignment(command):
+                state.set(index, None)
+            elif (following := state.following(index)) < len(commands) and \
+                    (fused := _fuseSet(command, state.resolve(following))) is not None:
+                state.set(index, fused)
+                state.set(following, None)
+                changed = True
+                continue
+            elif not (_isCopy(command) and (
+                    _coalesceBackward(state, index, pinned) or _coalesceForward(state, index, pinned))):
+                index = state.following(index)
+                continue
+            changed = True
+            index = state.following(index)
+        commands[:] = [state.resolve(position) for position, command in enumerate(commands) if command is not None]
+
+
+def peephole(code: Set[CodeScope]) -> Dict[str, int]:
+    """
+    Removes redundant commands: self-assignments, constant sets, which are changed
+    by the next command, and copies of temporary variables.
+    Returns the number of removed commands for every function.
+    """
+    pinned = pinnedTemporaries([commands for scope in code for commands in scope.code.values()])
+    result = dict()
+    for scope in code:
+        for key, commands in scope.code.items():
+            length = len(commands)
+            optimizeFunction(commands, pinned)
+            if length != len(commands):
+                path = '/'.join(scope.toPath(key))
+                result[path] = result.get(path, 0) + length - len(commands)
+    return result
+
+
+# Link-time deduplication
+# -----------------------
+
+_generated = re.compile(r'--[a-z-]+--\d+')
+"""
+Names of functions and predicates, which are created by compiler for statements.
+"""
+_unquoted = re.compile(r'^[^"\n]+', re.MULTILINE)
+"""
+Part of every command before its first JSON string, so text of user is never matched.
+"""
+_reference = re.compile(r'(?:(?<=\bfunction )|(?<=\bpredicate ))[\w.-]+:[\w./-]+')
+_resource = re.compile(r'(?<![\w.:/-])[\w.-]+:[\w./-]+')
+"""
+Any resource location, it's used to count references, where extra matches are safe.
+"""
+_folders = {'functions', 'predicates'}
+
+
+def generatedResources(paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Returns resource locations of generated functions and predicates by their paths.
+    Other files can be called from outside of the datapack, so they are never removed.
+    e.g:
+    "data/project/functions/--if--0/--else--1.mcfunction" -> "project:--if--0/--else--1"
+    """
+    result = dict()
+    for path in paths:
+        parts = path.split('/')
+        if len(parts) < 4 or parts[0] != 'data' or parts[2] not in _folders:
+            continue
+        name = parts[-1].rpartition('.')[0]
+        if _generated.fullmatch(name):
+            result[path] = f'{parts[1]}:{"/".join([*parts[3:-1], name])}'
+    return result
+
+
+def rewriteReferences(content: str, rename: Callable[[str], str]) -> str:
+    """
+    Renames resource locations of functions and predicates, which are arguments of commands,
+    e.g. "function project:--if--0" or "execute if predicate project:--predicate--1".
+    """
+    return _unquoted.sub(lambda line: _reference.sub(lambda x: rename(x[0]), line[0]), content)
+
+
+def deduplicate(files: Dict[str, str]) -> int:
+    """
+    Generated functions and predicates with the same content are replaced by one canonical file,
+    and references to removed files are rewritten. References of the file to itself
+    are not a part of its content, so identical recursive loops are also merged.
+    It's repeated, until nothing is changed, because rewritten references can make
+    more files identical. Returns the number of removed files.
+    """
+    resources = generatedResources(files)
+    removed = 0
+    while True:
+        canonical: Dict[tuple[str, str], str] = dict()
+        names: Dict[str, str] = dict()
+        for path in sorted(resources):
+            resource = resources[path]
+            content = rewriteReferences(files[path], lambda x: '\0' if x == resource else x)
+            if (target := canonical.setdefault((path.split('/')[2], content), resource)) != resource:
+                names[resource] = target
+        if not names:
+            return removed
+        for path in [path for path, resource in resources.items() if resource in names]:
+            del files[path], resources[path]
+            removed += 1
+        for path, content in files.items():
+            if path.endswith('.mcfunction'):
+                files[path] = rewriteReferences(content, lambda x: names.get(x, x))
+
+
+# Function inlining
+# -----------------
+
+def _calledFunction(command: bytecode.CodeType) -> Optional[str]:
+    """
+    Returns converted name of the function, which is called by the run step of execute command.
+    """
+    if not isinstance(command, bytecode.Execute) or not command.steps:
+        return None
+    if not isinstance(step := command.steps[-1], bytecode.StepRun) or \
+            not isinstance(step.step, bytecode.FunctionDirectCall):
+        return None
+    return bytecode.convert_var_name(step.step.name)
+
+
+def _isInlinable(command: bytecode.CodeType) -> bool:
+    """
+    Only a command can be run by execute, comments and JSON can't.
+    """
+    if isinstance(command, bytecode.RawJSON):
+        return False
+    text = command.toCode()
+    return bool(text) and not text.startswith('#') and '\n' not in text
+
+
+def inlineFunctions(code: Set[CodeScope]) -> int:
+    """
+    Generated function of one command, which is called only once by execute command,
+    is moved into the run step of this command, and its file is removed.
+    Function without commands is removed with its call, because conditions have no side effects.
+    It's repeated, until nothing is changed, because the caller can become short enough.
+    Returns the number of removed functions.
+    """
+    paths = {'/'.join(['data', *scope.toPath(key)]): (scope, key) for scope in code for key in scope.code}
+    functions = {resource: paths[path] for path, resource in generatedResources(paths).items()
+                 if path.endswith('.mcfunction')}
+
+    # References are only moved by inlining, so they are counted once
+    calls: Dict[str, int] = dict()
+    for scope in code:
+        for commands in scope.code.values():
+            for command in commands:
+                for name in _resource.findall(command.toCode()):
+                    calls[name] = calls.get(name, 0) + 1
+
+    inlined: List[tuple[CodeScope, str]] = list()
+    changed = True
+    while changed:
+        changed = False
+        for scope in code:
+            for commands in scope.code.values():
+                result = list()
+                for command in commands:
+                    while (name := _calledFunction(command)) in functions and calls.get(name) == 1:
+                        owner, key = functions[name]
+                        body = owner.code[key]
+                        if body is commands or len(body) > 1 or body and not _isInlinable(body[0]):
+                            break
+                        if not body:
+                            command = None
+                        elif isinstance(body[0], bytecode.Execute):
+                            command = replace(command, steps=[*command.steps[:-1], *body[0].steps])
+                        else:
+                            command = replace(command, steps=[*command.steps[:-1], bytecode.StepRun(body[0])])
+                        body.clear()
+                        inlined.append(functions.pop(name))
+                        changed = True
+                        if command is None:
+                            break
+                    if command is not None:
+                        result.append(command)
+                commands[:] = result
+
+    for scope, key in inlined:
+        del scope.code[key]
+    return len(inlined)
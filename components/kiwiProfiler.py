@@ -0,0 +1,135 @@
+"""
+This module provides tools to profile compiler stages.
+It's used by --profile mode of compiler.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Dict, Iterator
+from pathlib import Path
+from contextlib import contextmanager
+from threading import Thread, Event, get_ident
+from cProfile import Profile
+import sys
+
+# Custom libraries
+# ----------------
+
+from components.kiwiMemo import Statistics
+
+
+class Sampler(Thread):
+    """
+    The main task of this class is
+    - sample call stack of the thread, while the stage is running
+    """
+
+    def __init__(self, thread: int, stage: str, stacks: Dict[str, int], interval: float):
+        super().__init__(daemon=True)
+        self.thread = thread
+        self.stage = stage
+        self.stacks = stacks
+        self.interval = interval
+        self.stopped = Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread)  # noqa
+            names = list()
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename == __file__:
+                    # Thread is in profiler itself, the sample is skipped
+                    break
+                names.append(f'{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if frame is not None:
+                continue
+            key = ';'.join([self.stage, *reversed(names)])
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Profiler:
+    """
+    The main task of this class is
+    - collect cProfile statistics and sampled call stacks of every stage
+    - dump them into pstats and flamegraph-compatible collapsed stack files
+    """
+
+    directory: Path
+    name: str
+    interval: float
+    profiles: Dict[str, Profile]
+    stacks: Dict[str, int]
+
+    def __init__(self, directory: Path, name: str, interval: float = 0.001):
+        """
+        :param directory:
+        Directory, where files are dumped.
+        :param name:
+        Name of module, it's used as prefix of file names.
+        """
+        self.directory = directory
+        self.name = name
+        self.interval = interval
+        self.profiles = dict()
+        self.stacks = dict()
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        profile = self.profiles.setdefault(stage, Profile())
+        sampler = Sampler(get_ident(), stage, self.stacks, self.interval)
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switchInterval, self.interval))
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            sys.setswitchinterval(switchInterval)
+
+    def dump(self):
+        """
+        Writes <name>.<stage>.pstats for every stage and <name>.collapsed with stacks of all stages.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stage, profile in self.profiles.items():
+            profile.dump_stats(self.directory / f'{self.name}.{stage}.pstats')
+        with (self.directory / f'{self.name}.collapsed').open('w') as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write(f'{stack} {count}\n')
+
+
+def formatReport(timings: Dict[str, float], memo: Statistics, rules: int = 10) -> str:
+    """
+    Returns the table of stage timings with memo cache statistics of parser,
+    and the rules, which backtrack the most.
+    """
+    lines = ['Profile of compiler stages:']
+    total = sum(timings.values())
+    hits = sum(counters[0] for counters in memo.values())
+    misses = sum(counters[1] for counters in memo.values())
+    for stage, value in timings.items():
+        line = f'  {stage:<12} {value:10.6f} s {value / total if total else 0:7.1%}'
+        if stage == 'parser' and memo:
+            requests = hits + misses
+            line += f'   memo: {hits} hits, {misses} misses' \
+                    f' ({hits / requests if requests else 0:.1%} hit rate)'
+        lines.append(line)
+    lines.append(f'  {"total":<12} {total:10.6f} s')
+    if memo:
+        lines.append('Parser rules with the most backtracking:')
+        lines.append(f'  {"rule":<32} {"hits":>10} {"misses":>10} {"backtracks":>10}')
+        for rule, (ruleHits, ruleMisses, backtracks) in sorted(
+                memo.items(), key=lambda item: (-item[1][2], item[0]))[:rules]:
+            lines.append(f'  {rule:<32} {ruleHits:>10} {ruleMisses:>10} {backtracks:>10}')
+    return '\n'.join(lines)
@@ -12,9 +12,9 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import Optional, Set, Any, List, TYPE_CHECKING, Dict
+from typing import Optional, Set, Any, List, TYPE_CHECKING, Dict, Iterable
 from pathlib import Path
-from functools import reduce
+from functools import lru_cache, cached_property
 from abc import ABC, abstractmethod
 
 # Custom libraries
@@ -25,28 +25,67 @@ if TYPE_CHECKING:
     from LangApi.abstract import Abstract
 
 
-class Attr(list):
+@lru_cache(maxsize=1 << 16)
+def convertName(name: str) -> str:
+    """
+    Converts upper case letters of the name into lower case ones with dash before them,
+    because minecraft doesn't support upper case in names.
+    e.g:
+    myVariable -> my-variable
+    """
+    mode = True
+    result = str()
+    for symbol in name:
+        if mode == symbol.isupper():
+            mode = not mode
+            result += '-'
+            symbol = symbol.lower()
+        result += symbol
+    return result
+
+
+class Attr(tuple):
     """
     Some basic representation of an attribute.
-    It's just a list of strings, except it has
+    It's just an immutable tuple of strings, except it has
     additional methods, and we can check type using
     if isinstance.
+    Attributes are interned, so the same attribute is created once,
+    and its string forms are computed only once as well.
     """
 
-    def append(self, __object: Any):
-        """
-        Append an object to the attribute if it's not None.
-        """
-        if __object is None:
-            return
-        super().append(__object)
+    _interned: Dict[Any, Attr] = dict()
+    _limit = 1 << 16
+
+    def __new__(cls, parts: Iterable[str] = ()):
+        parts = tuple(parts)
+        if (result := Attr._interned.get((cls, parts))) is None:
+            if len(Attr._interned) >= Attr._limit:
+                Attr._interned.clear()
+            result = Attr._interned[(cls, parts)] = super().__new__(cls, parts)
+        return result
+
+    def __reduce__(self):
+        return self.__class__, (tuple(self),)
+
+    def __copy__(self) -> Attr:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Attr:
+        return self
 
     def __add__(self, other) -> Attr:
         """
         I have overloaded the __add__ method,
         because natively it does change the class of Attr.
         """
-        return self.__class__(super().__add__(other))
+        return self.__class__((*self, *other))
+
+    def __radd__(self, other) -> Attr:
+        """
+        It's used, when list is added to the attribute.
+        """
+        return self.__class__((*other, *self))
 
     def __getitem__(self, item):
         """
@@ -57,6 +96,18 @@ class Attr(list):
             return self.__class__(super().__getitem__(item))
         return super().__getitem__(item)
 
+    @cached_property
+    def _string(self) -> str:
+        return '.'.join(self)
+
+    @cached_property
+    def _path(self) -> Path:
+        return Path(*self)
+
+    @cached_property
+    def _converted(self) -> Attr:
+        return self.__class__(map(convertName, self))
+
     def toName(self) -> str:
         """
         Just return you the last string of list
@@ -67,23 +118,26 @@ class Attr(list):
         """
         Return the all strings joined together using dot as separator.
         """
-        return '.'.join(self)
+        return self._string
 
     def toPath(self) -> Path:
         """
         Used to convert the attribute to a Path object.
         """
-        return reduce(lambda x, y: x / y,
-                      [Path(), *self])
+        return self._path
+
+    def toConverted(self) -> Attr:
+        """
+        Returns the attribute, where every string is converted by convertName.
+        """
+        return self._converted
 
     def withSuffix(self, prefix: str):
         """
         It's used to add a suffix to the last string.
         But, you can't add a prefix twice (it can charge and explode!).
         """
-        newAttr = self.__class__(self)
-        newAttr[-1] += prefix
-        return newAttr
+        return self[:-1] + (self[-1] + prefix,)
 
 
 class DirAttr(Attr):
@@ -95,27 +149,51 @@ class DirAttr(Attr):
     """
     directory: Attr
 
-    def __init__(self, directory: Attr, *args):
-        self.directory = directory
-        super().__init__(*args)
+    def __new__(cls, directory: Attr, parts: Iterable[str] = ()):
+        parts = tuple(parts)
+        if (result := Attr._interned.get((cls, directory, parts))) is None:
+            if len(Attr._interned) >= Attr._limit:
+                Attr._interned.clear()
+            result = Attr._interned[(cls, directory, parts)] = tuple.__new__(cls, parts)
+            result.directory = directory
+        return result
+
+    def __reduce__(self):
+        return self.__class__, (self.directory, tuple(self))
+
+    # Tuple compares only parts, but attributes in different directories are different
+    def __eq__(self, other) -> bool:
+        return self is other or (
+            other.__class__ is self.__class__ and self.directory == other.directory and tuple.__eq__(self, other))
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.__class__, self.directory, tuple(self)))
 
     def __add__(self, other) -> Attr:
-        return self.__class__(self.directory, super().__add__(other))
+        return self.__class__(self.directory, (*self, *other))
+
+    def __radd__(self, other) -> Attr:
+        return self.__class__(self.directory, (*other, *self))
 
     def __getitem__(self, item):
         if isinstance(item, slice):
-            return self.__class__(self.directory, super().__getitem__(item))
-        return super().__getitem__(item)
+            return self.__class__(self.directory, tuple.__getitem__(self, item))
+        return tuple.__getitem__(self, item)
 
-    def toName(self) -> str:
-        return str(self[-1])
-
-    def toString(self) -> str:
+    @cached_property
+    def _string(self) -> str:
         """
         Unlike the Attr.toString, this method also adds directory prefix.
         """
         return f"{self.directory.toString()}:{'/'.join(self)}"
 
+    @cached_property
+    def _converted(self) -> Attr:
+        return self.__class__(self.directory, map(convertName, self))
+
 
 Key = str | Attr
 
@@ -129,9 +207,23 @@ class BasicScope:
     """
     private_mode = False
     content: dict
-    hide: Set[str] = set()
     parent: Optional[BasicScope]
     name: Optional[str] = None
+    _hide: Optional[Set[str]] = None
+
+    @property
+    def hide(self) -> Set[str]:
+        """
+        Names of private members, they are shared by all scopes of one scope system,
+        so the set is kept by the root scope.
+        """
+        scope = self
+        while scope._hide is None:
+            if getattr(scope, 'parent', None) is None:
+                scope._hide = set()
+                break
+            scope = scope.parent
+        return scope._hide
 
     def _defaultDirectName(self) -> Optional[str]:
         return self.name
@@ -238,8 +330,8 @@ class CodeScope(BasicScope, ABC):
 
 
 class ScopeSystem:
-    _iterator = 0
-    _builtInScope: BasicScope = BasicScope(dict())
+    _iterator: int
+    _builtInScope: BasicScope
     globalScope: BasicScope
     localScope: BasicScope
 
@@ -249,7 +341,10 @@ class ScopeSystem:
         """
         if libScope is None:
             libScope = dict()
+        self._iterator = 0
+        self._builtInScope = BasicScope(dict())
         self.globalScope = BasicScope(dict(), self._builtInScope)
+        self.globalScope._hide = set()
         self.globalScope.content |= libScope
         self.localScope = self.globalScope
 
@@ -324,5 +419,5 @@ class ScopeSystem:
         """
         self.localScope.write(name, value)
         if self.localScope.private_mode:
-            name = name[0] if isinstance(name, list) else name
+            name = name[0] if isinstance(name, Attr) else name
             self.localScope.hide.add(name)
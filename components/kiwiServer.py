@@ -0,0 +1,219 @@
+"""
+This module provides the compile server.
+It keeps compiler warm in a pool of worker processes,
+and compiles projects, which are requested by JSON lines from stdin or local socket.
+
+Every request is a JSON object:
+    {"id": 1, "path": "project", "output": "project/bin", "config": {"peephole": false}}
+Every response is a JSON object in the same line format:
+    {"id": 1, "success": true, "time": 0.1, "timings": {...}, "files": 8, "diagnostics": ""}
+Responses are written when jobs are done, so their order can differ from order of requests.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Callable, Dict, Deque, Any, Optional, TextIO
+from concurrent.futures import ProcessPoolExecutor, Future
+from socketserver import ThreadingTCPServer, StreamRequestHandler
+from threading import Condition, BoundedSemaphore, Lock
+from collections import deque
+import signal
+import json
+import sys
+import os
+
+# Custom libraries
+# ----------------
+
+import components.kiwiColors as colors
+
+
+Job = Dict[str, Any]
+Result = Dict[str, Any]
+
+
+class Server:
+    """
+    The main task of this class is
+    - schedule compile jobs across bounded pool of worker processes
+    - read requests and write responses in JSON lines format
+    """
+
+    executor: ProcessPoolExecutor
+    worker: Callable[[Job], Result]
+    pending: BoundedSemaphore
+    """
+    Count of jobs, which are submitted, but not done, is limited,
+    so reading of requests waits for free workers.
+    """
+    projects: Dict[str, Deque[Callable[[], None]]]
+    """
+    Jobs of the same project write the same cache and output files, so they are run one by one.
+    The first job of every queue is running, others are waiting for it.
+    """
+    lock: Lock
+
+    def __init__(self, worker: Callable[[Job], Result], initializer: Callable[[], None],
+                 workers: Optional[int] = None):
+        """
+        :param worker:
+        Function, which compiles the job in worker process, it should be picklable.
+        :param initializer:
+        Function, which is called once in every worker process.
+        """
+        workers = workers or os.cpu_count() or 1
+        self.worker = worker
+        self.executor = ProcessPoolExecutor(workers, initializer=initializer)
+        self.pending = BoundedSemaphore(2 * workers)
+        self.projects = dict()
+        self.lock = Lock()
+
+    def submit(self, line: str, respond: Callable[[Result], None]):
+        """
+        Parses the request and submits it to the pool,
+        respond is called with the result, when the job is done.
+        """
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or not isinstance(job.get('path'), str):
+                raise ValueError('request should be a JSON object with "path" string')
+        except ValueError as e:
+            respond({'id': None, 'success': False, 'diagnostics': f'Invalid request: {e}'})
+            return
+
+        self.pending.acquire()
+        project = os.path.realpath(job['path'])
+
+        def done(future: Future):
+            self.pending.release()
+            self.finish(project)
+            try:
+                result = future.result()
+            except Exception as e:  # noqa
+                result = {'success': False, 'diagnostics': f'Worker failed: {e!r}'}
+            respond({'id': job.get('id')} | result)
+
+        def start():
+            try:
+                future = self.executor.submit(self.worker, job)
+            except BaseException as e:
+                # Callback is never called, so the job is finished here
+                self.pending.release()
+                self.finish(project)
+                if not isinstance(e, Exception):
+                    raise
+                respond({'id': job.get('id'), 'success': False, 'diagnostics': f'Job is not submitted: {e!r}'})
+                return
+            future.add_done_callback(done)
+
+        self.schedule(project, start)
+
+    def schedule(self, project: str, start: Callable[[], None]):
+        """
+        Starts the job at once, if there are no running jobs of the project,
+        otherwise it's started after them.
+        """
+        with self.lock:
+            waiting = self.projects.setdefault(project, deque())
+            waiting.append(start)
+            if len(waiting) > 1:
+                return
+        start()
+
+    def finish(self, project: str):
+        """
+        Removes the running job of the project, and starts the next one.
+        """
+        with self.lock:
+            waiting = self.projects[project]
+            waiting.popleft()
+            if not waiting:
+                del self.projects[project]
+                return
+            start = waiting[0]
+        start()
+
+    def serveStream(self, reader: TextIO, writer: TextIO):
+        """
+        Reads requests from the reader until end of file, and waits for all jobs.
+        """
+        condition = Condition()
+        running = 0
+
+        def respond(result: Result):
+            nonlocal running
+            with condition:
+                try:
+                    writer.write(json.dumps(result) + '\n')
+                    writer.flush()
+                except (OSError, ValueError) as e:
+                    print(f'{colors.Red}Response is dropped: {e!r}{colors.Default}', file=sys.stderr)
+                finally:
+                    running -= 1
+                    condition.notify_all()
+
+        for line in reader:
+            if not line.strip():
+                continue
+            with condition:
+                running += 1
+            self.submit(line, respond)
+        with condition:
+            condition.wait_for(lambda: running == 0)
+
+    def serveSocket(self, port: int, host: str = '127.0.0.1'):
+        """
+        Accepts connections on the local socket, every connection sends requests
+        and gets responses in JSON lines format, like stdin.
+        """
+        server = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self):
+                reader = (line.decode() for line in self.rfile)
+                writer = _SocketWriter(self.wfile)
+                server.serveStream(reader, writer)  # noqa
+
+        def terminate(*_):
+            raise KeyboardInterrupt
+
+        # Background processes ignore Ctrl+C, so SIGTERM stops the server as well
+        signal.signal(signal.SIGTERM, terminate)
+        with _TCPServer((host, port), Handler) as tcp:
+            print(f'Compile server is listening on {host}:{port}, press Ctrl+C to stop', file=sys.stderr)
+            try:
+                tcp.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+class _TCPServer(ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _SocketWriter:
+    """
+    Text writer over binary stream of socket.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str):
+        try:
+            self.stream.write(text.encode())
+        except OSError:
+            print(f'{colors.Red}Connection is closed, response is dropped{colors.Default}', file=sys.stderr)
+
+    def flush(self):
+        try:
+            self.stream.flush()
+        except OSError:
+            pass
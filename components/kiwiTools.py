@@ -9,10 +9,11 @@ from __future__ import annotations
 # -----------------
 
 from dataclasses import dataclass as _dataclass
-from typing import Any, List, Callable
+from typing import Any, List, Callable, Dict, Optional, Iterable, Generator
+from types import GeneratorType
 from tokenize import tok_name
 from itertools import chain
-from inspect import isclass
+from inspect import isclass, getattr_static
 
 # Custom libraries
 # ----------------
@@ -127,6 +128,44 @@ def dumpScopeSystem(scope: ScopeSystem):
     return _colors.Red + 'globals' + f(scope.globalScope) + _colors.ResetAll
 
 
+def flattenTuple(value: tuple) -> tuple:
+    """
+    Flattens nested tuples level by level, while every item of the level is iterable.
+    e.g:
+    ((a, b), (c,)) -> (a, b, c)
+    ((a, b), c) -> ((a, b), c)
+    """
+    while value and all(isinstance(item, Iterable) and not isinstance(item, str) for item in value):
+        value = tuple(chain.from_iterable(value))
+    return value
+
+
+def runSteps(step: Callable[[Any], Any], task: Any) -> Any:
+    """
+    Runs visiting of the tree using explicit stack instead of recursion.
+    The step function returns either the result of the task or a generator,
+    which yields nested tasks and receives their results.
+    Generator can yield a generator of nested step as well, then it's run directly.
+    """
+    result = step(task)
+    if not isinstance(result, GeneratorType):
+        return result
+    stack: List[Generator] = [result]
+    result = None
+    while stack:
+        try:
+            task = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop(-1)
+            result = stop.value
+            continue
+        result = task if isinstance(task, GeneratorType) else step(task)
+        if isinstance(result, GeneratorType):
+            stack.append(result)
+            result = None
+    return result
+
+
 @_dataclass
 class AST_Task:
     """
@@ -152,25 +191,42 @@ class AST_Visitor:
             attribute = node.__getattribute__(annotation)
             yield annotation, attribute
 
+    _handlers: Dict[type, Optional[Any]] = dict()
+    """
+    Dispatch table of the class, it maps node classes to methods with the same names.
+    It's built once at class creation, unknown node classes are added on first visit.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = dict()
+        for node in vars(_kiwi).values():
+            if isclass(node) and issubclass(node, (_kiwi.AST, _kiwi.Token)):
+                cls._handlers[node] = getattr_static(cls, node.__name__, None)
+
     def knockCall(self, node: Any) -> Callable[[Any], None]:
         """
         It's used to try to find method among attributes.
         """
-        name = node.__class__.__name__
-        if name in dir(self):
-            return self.__getattribute__(name)
-
-    def unpackTuple(self, value: tuple) -> tuple:
-        if len(value) == 0:
-            return tuple()
         try:
-            return self.unpackTuple(tuple(chain.from_iterable(value)))
-        except TypeError:
-            return value
+            handler = self._handlers[node.__class__]
+        except KeyError:
+            handler = self._handlers[node.__class__] = getattr_static(self.__class__, node.__class__.__name__, None)
+        if handler is not None:
+            return handler.__get__(self, self.__class__)
+
+    @staticmethod
+    def unpackTuple(value: tuple) -> tuple:
+        return flattenTuple(value)
+
+    _no_references: int
+    _tasks: List[list]
+    _currentIndex: List[int]
 
-    _no_references = 0
-    _tasks: List[list] = list()
-    _currentIndex: List[int] = list()
+    def __init__(self):
+        self._no_references = 0
+        self._tasks = list()
+        self._currentIndex = list()
 
     def getLastCommands(self, index: int = 0) -> List[Any]:
         return self._tasks[-(1 + index)][self._currentIndex[-(1 + index)] + 1:]
@@ -193,45 +249,57 @@ class AST_Visitor:
         Also, if the input value is a list with tuple, tuple will be unpacked.
         e.g:
         If the input value is a list of some objects, objects will be handled.
+        Lists and nodes without handle function are visited using explicit stack,
+        so deep trees don't reach recursion limit.
+        Handle function can be a generator too, then it yields child nodes
+        and receives their visited values instead of calling this method.
         """
         self._no_references += no_references
+        result = runSteps(self._visitStep, node)
+        self._no_references -= no_references
+        return result
+
+    def _visitStep(self, node: Any) -> Any:
         if isinstance(node, list):
-            result = list()
-            self._tasks.append(node)
-            self._currentIndex.append(0)
-            while self._currentIndex[-1] < len(self._tasks[-1]):
-                visited = self.visit(self._tasks[-1][self._currentIndex[-1]])
-                self._currentIndex[-1] += 1
-                if isinstance(visited, tuple):
-                    result.extend(self.unpackTuple(visited))
-                    continue
-                if visited is None:
-                    continue
-                result.append(visited)
-            self._no_references -= no_references
-            self._currentIndex.pop(-1)
-            self._tasks.pop(-1)
-            return result
+            return self._visitList(node)
         if isinstance(node, _kiwi.Token):
             if function := self.knockCall(node):
-                result = function(node)
-                self._no_references -= no_references
-                return result
-            self._no_references -= no_references
+                return function(node)
             return node
         if isinstance(node, _kiwi.AST):
             if function := self.knockCall(node):
-                result = function(node)
-                self._no_references -= no_references
-                return result
-            for annotation, attribute in self.getAttributes(node):
-                visited = self.visit(attribute)
-                node.__setattr__(annotation, visited)
-            self._no_references -= no_references
-            return node
+                return function(node)
+            return self._visitAttributes(node)
         if isinstance(node, AST_Task):
             return node.function(*node.args)
 
+    def _visitList(self, node: list) -> Generator[Any, Any, list]:
+        result = list()
+        self._tasks.append(node)
+        self._currentIndex.append(0)
+        while self._currentIndex[-1] < len(self._tasks[-1]):
+            visited = self._visitStep(self._tasks[-1][self._currentIndex[-1]])
+            if isinstance(visited, GeneratorType):
+                visited = yield visited
+            self._currentIndex[-1] += 1
+            if isinstance(visited, tuple) and not isinstance(visited, Attr):
+                result.extend(flattenTuple(visited))
+                continue
+            if visited is None:
+                continue
+            result.append(visited)
+        self._currentIndex.pop(-1)
+        self._tasks.pop(-1)
+        return result
+
+    def _visitAttributes(self, node: _kiwi.AST) -> Generator[Any, Any, _kiwi.AST]:
+        for annotation, attribute in self.getAttributes(node):
+            visited = self._visitStep(attribute)
+            if isinstance(visited, GeneratorType):
+                visited = yield visited
+            node.__setattr__(annotation, visited)
+        return node
+
     def visitAST(self, node: _kiwi.AST | _kiwi.Token) -> List[Any]:
         """
         I hope no one will use this, it's lazy method. :/
@@ -0,0 +1,122 @@
+"""
+This module provides writers of datapack files.
+It's the last stage of constructor, which puts file contents on disk,
+either into output directory or into zip archive.
+"""
+
+from __future__ import annotations
+
+# Default libraries
+# -----------------
+
+from typing import Dict, List, Tuple, Set, Optional, Iterable
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+import os
+
+
+class Writer:
+    """
+    The main task of this class is
+    - create all directories of output files at once
+    - write files by the pool of threads, every file is written atomically
+    """
+
+    root: Path
+    workers: int
+    """
+    Count of threads, it's also the limit of open files.
+    """
+    threshold = 64
+    """
+    Smaller count of files is written without threads.
+    """
+
+    def __init__(self, root: Path, workers: Optional[int] = None):
+        self.root = root
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    @staticmethod
+    def leafDirectories(paths: Iterable[Path]) -> Set[Path]:
+        """
+        Returns directories of the files, which aren't parents of other directories,
+        because creating them creates their parents as well.
+        """
+        directories = {path.parent for path in paths}
+        parents = set()
+        for directory in directories:
+            parents.update(directory.parents)
+        return directories - parents
+
+    def write(self, files: Dict[str, str]):
+        """
+        Writes files, paths are relative to the root directory.
+        """
+        for directory in self.leafDirectories(self.root / path for path in files):
+            directory.mkdir(parents=True, exist_ok=True)
+        targets = [(os.path.join(self.root, path), content) for path, content in files.items()]
+        if self.workers == 1 or len(targets) < self.threshold:
+            self.writeFiles(targets)
+            return
+        # Every thread gets its own part of files, so there are no tasks per file
+        with ThreadPoolExecutor(self.workers) as executor:
+            for future in [executor.submit(self.writeFiles, targets[index::self.workers])
+                           for index in range(self.workers)]:
+                future.result()
+
+    @staticmethod
+    def writeFiles(targets: List[Tuple[str, str]]):
+        """
+        Content is written into temporary file near the target,
+        then it replaces the target, so nobody sees half-written file.
+        """
+        suffix = f'.{os.getpid()}.tmp'
+        for target, content in targets:
+            temporary = target + suffix
+            try:
+                with open(temporary, 'w') as file:
+                    file.write(content)
+                os.replace(temporary, target)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.unlink(temporary)
+                raise
+
+
+class ZipWriter:
+    """
+    The main task of this class is
+    - write files into zip archive without creating them on disk
+
+    Entries are sorted and have fixed timestamps and attributes,
+    so the archive depends only on paths and contents of files.
+    """
+
+    archive: Path
+    timestamp = (1980, 1, 1, 0, 0, 0)
+    """
+    The earliest time, which can be stored in zip archive.
+    """
+
+    def __init__(self, archive: Path):
+        self.archive = archive
+
+    def write(self, files: Dict[str, str]):
+        """
+        Writes the whole archive, paths of files are names of entries.
+        The archive is replaced at once, like files of the writer.
+        """
+        self.archive.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.archive.with_name(f'.{self.archive.name}.{os.getpid()}.tmp')
+        try:
+            with ZipFile(temporary, 'w') as archive:
+                for path in sorted(files):
+                    info = ZipInfo(path, self.timestamp)
+                    info.create_system = 3
+                    info.external_attr = 0o644 << 16
+                    archive.writestr(info, files[path], ZIP_DEFLATED, 9)
+            os.replace(temporary, self.archive)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
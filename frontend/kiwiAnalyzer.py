@@ -9,7 +9,7 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from typing import TYPE_CHECKING, Any, List, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
 # Custom libraries
 # ----------------
@@ -79,7 +79,7 @@ class Analyzer(AST_Visitor):
     # ------------------
 
     config: compiler.ConfigGeneral
-    text: List[str]
+    index: kiwi.LineIndex
 
     def __init__(
             self,
@@ -90,6 +90,8 @@ class Analyzer(AST_Visitor):
             api: LangApi.api.API,
             text: str
     ):
+        super().__init__()
+
         # Parts of compiler
         # -----------------
 
@@ -103,7 +105,7 @@ class Analyzer(AST_Visitor):
         # ------------------
 
         self.config = builder.configGeneral
-        self.text = text.splitlines()
+        self.index = kiwi.LineIndex(text)
 
         # Initialization
         # --------------
@@ -117,14 +119,7 @@ class Analyzer(AST_Visitor):
         """
         This method is used to get native string from AST element.
         """
-        result = list()
-        if (line := node.start[0]) == node.end[0]:
-            return self.text[line - 1][node.start[1]:node.end[1] + 1]
-        result.append(self.text[node.start[0] - 1][node.start[1]:])
-        for line in range(node.start[0], node.end[0] - 1):
-            result.append(self.text[line])
-        result.append(self.text[node.end[0] - 1][:node.end[1] + 1])
-        return '\n'.join(result)
+        return self.index.source(node)
 
     # MODULE DECLARATION
     # ==================
@@ -497,11 +492,13 @@ class Analyzer(AST_Visitor):
 
     # OPERATORS
     # =========
+    # Chains of operators can be nested very deeply,
+    # so child nodes are yielded to visitor instead of recursive visiting.
 
     _unaryOps: Dict[str, LangApi.abstract.ConstructMethod]
 
     def UnaryOp(self, node: kiwi.UnaryOp):
-        x = self.visit(node.x)
+        x = yield node.x
         return LangApi.abstract.Construct(
             self._unaryOps[str(node.op)],
             x,
@@ -511,7 +508,8 @@ class Analyzer(AST_Visitor):
     _binaryOps: Dict[str, LangApi.abstract.ConstructMethod]
 
     def BinaryOp(self, node: kiwi.BinaryOp):
-        x, y = self.visit(node.x), self.visit(node.y)
+        x = yield node.x
+        y = yield node.y
         return LangApi.abstract.Construct(
             self._binaryOps[str(node.op)],
             x,
@@ -18,6 +18,7 @@ from itertools import chain
 from pegen.parser import memoize, memoize_left_rec, Parser
 from pegen.tokenizer import Tokenizer
 from typing import List as _List
+from components.kiwiMemo import MemoCache
 import components.kiwiASO as kiwi
 
 
@@ -29,33 +30,72 @@ class AST:
     parser: KiwiParser
     module: kiwi.Module
 
-    def __init__(self, tokenizer: Tokenizer):
+    def __init__(self, tokenizer: Tokenizer, cache: dict = None):
+        """
+        :param cache:
+        Memo cache of parser, it's used to collect statistics of parser
+        or to forget entries behind top-level statements (see MemoCache).
+        """
         self.parser = KiwiParser(tokenizer)
+        if cache is not None:
+            self.parser._cache = cache
         self.module = self.parser.start()
 
+    @classmethod
+    def fromModule(cls, module: kiwi.Module) -> AST:
+        """
+        Returns AST of the module, which has been parsed before (see BuildCache.loadTree).
+        """
+        result = cls.__new__(cls)
+        result.module = module
+        return result
+
     def eval(self, tokenizer: Tokenizer) -> kiwi.expression:
         return KiwiParser(tokenizer).expression()
 
+    def evalMany(self, tokenizer: Tokenizer) -> Optional[_List[kiwi.expression]]:
+        """
+        Parses expressions, which are written on separate lines, by one parser.
+        Returns None, if any line isn't an expression.
+        """
+        parser = KiwiParser(tokenizer)
+        result = list()
+        while not parser.expect('ENDMARKER'):
+            if (expression := parser.expression()) is None or not parser.expect('NEWLINE'):
+                return None
+            result.append(expression)
+        return result
+
     def exec(self, tokenizer: Tokenizer) -> _List[kiwi.statement]:
         return KiwiParser(tokenizer).start().body
 
 
+def commit(parser: Parser, tree: Any) -> Any:
+    """
+    It's called after every top-level statement,
+    the parser never returns before it, so memo cache can evict entries behind it.
+    """
+    if isinstance(parser._cache, MemoCache):
+        parser._cache.commit(parser._mark())
+    return tree
+
+
 #
 # Keywords and soft keywords are listed at the end of the parser definition.
 class KiwiParser(Parser):
 
     @memoize
     def start(self) -> Optional[kiwi . Module]:
-        # start: import_stmts statements $ | import_stmts $ | statements $ | $
+        # start: import_stmts module_statements $ | import_stmts $ | module_statements $ | $
         mark = self._mark()
         if (
             (i := self.import_stmts())
             and
-            (v := self.statements())
+            (v := self.module_statements())
             and
             (_endmarker := self.expect('ENDMARKER'))
         ):
-            return i [0] . start , v [- 1] . end , kiwi . Module ( i , v )
+            return kiwi . Module ( i [0] . start , v [- 1] . end , i , v )
         self._reset(mark)
         if (
             (i := self.import_stmts())
@@ -65,7 +105,7 @@ class KiwiParser(Parser):
             return kiwi . Module ( i [0] . start , i [- 1] . end , i , [] )
         self._reset(mark)
         if (
-            (v := self.statements())
+            (v := self.module_statements())
             and
             (_endmarker := self.expect('ENDMARKER'))
         ):
@@ -91,12 +131,12 @@ class KiwiParser(Parser):
 
     @memoize
     def import_stmt(self) -> Optional[Any]:
-        # import_stmt: 'import' &&(dotted_as_names) ((NEWLINE | ';'))+
+        # import_stmt: 'import' (&&(dotted_as_names)) ((NEWLINE | ';'))+
         mark = self._mark()
         if (
             (literal := self.expect('import'))
             and
-            (forced := self.expect_forced(self.dotted_as_names(), '''(dotted_as_names)'''))
+            (v := self.expect_forced(self.dotted_as_names(), '''(dotted_as_names)'''))
             and
             (_loop1_2 := self._loop1_2())
         ):
@@ -115,7 +155,7 @@ class KiwiParser(Parser):
             and
             (a := self.import_stmt())
         ):
-            return [s . start , a [- 1] . end , kiwi . Alias ( '' . join ( v ) , a )]
+            return [kiwi . Alias ( s . start , a [- 1] . end , '.' . join ( x . value for x in v ) , a )]
         self._reset(mark)
         return None
 
@@ -132,34 +172,34 @@ class KiwiParser(Parser):
 
     @memoize
     def dotted_as_name(self) -> Optional[Any]:
-        # dotted_as_name: dotted_name "as" &&(NAME_) | dotted_name
+        # dotted_as_name: dotted_name "as" (&&(NAME_)) | dotted_name
         mark = self._mark()
         if (
             (v := self.dotted_name())
             and
             (literal := self.expect("as"))
             and
-            (forced := self.expect_forced(self.NAME_(), '''(NAME_)'''))
+            (a := self.expect_forced(self.NAME_(), '''(NAME_)'''))
         ):
-            return kiwi . Alias ( v [0] . start , a . end , '' . join ( v ) , a )
+            return kiwi . Alias ( v [0] . start , a . end , '.' . join ( x . value for x in v ) , a )
         self._reset(mark)
         if (
             (v := self.dotted_name())
         ):
-            return kiwi . Alias ( v [0] . start , v [- 1] . end , '' . join ( v ) , v [- 1] )
+            return kiwi . Alias ( v [0] . start , v [- 1] . end , '.' . join ( x . value for x in v ) , v [- 1] )
         self._reset(mark)
         return None
 
     @memoize_left_rec
     def dotted_name(self) -> Optional[Any]:
-        # dotted_name: dotted_name '.' &&(NAME_) | NAME_
+        # dotted_name: dotted_name '.' (&&(NAME_)) | NAME_
         mark = self._mark()
         if (
             (v := self.dotted_name())
             and
             (literal := self.expect('.'))
             and
-            (forced := self.expect_forced(self.NAME_(), '''(NAME_)'''))
+            (a := self.expect_forced(self.NAME_(), '''(NAME_)'''))
         ):
             return [* v , a]
         self._reset(mark)
@@ -181,6 +221,28 @@ class KiwiParser(Parser):
         self._reset(mark)
         return None
 
+    @memoize
+    def module_statements(self) -> Optional[Any]:
+        # module_statements: module_statement+
+        mark = self._mark()
+        if (
+            (_loop1_6 := self._loop1_6())
+        ):
+            return _loop1_6
+        self._reset(mark)
+        return None
+
+    @memoize
+    def module_statement(self) -> Optional[Any]:
+        # module_statement: statement
+        mark = self._mark()
+        if (
+            (v := self.statement())
+        ):
+            return commit ( self , v )
+        self._reset(mark)
+        return None
+
     @memoize
     def statement(self) -> Optional[Any]:
         # statement: simple_stmt ((NEWLINE | ';'))+ | compound_stmt
@@ -188,7 +250,7 @@ class KiwiParser(Parser):
         if (
             (v := self.simple_stmt())
             and
-            (_loop1_6 := self._loop1_6())
+            (_loop1_7 := self._loop1_7())
         ):
             return v
         self._reset(mark)
@@ -206,7 +268,7 @@ class KiwiParser(Parser):
         if (
             (v := self.simple_stmt())
             and
-            (_loop1_7 := self._loop1_7())
+            (_loop1_8 := self._loop1_8())
         ):
             return v
         self._reset(mark)
@@ -291,32 +353,32 @@ class KiwiParser(Parser):
 
     @memoize
     def assignment(self) -> Optional[Any]:
-        # assignment: annotations '=' &&(','.expression+) | ','.expression+ '=' &&(','.expression+) | ','.expression+ augassign &&(','.expression+) | annotations
+        # assignment: annotations '=' (&&(','.expression+)) | ','.expression+ '=' (&&(','.expression+)) | ','.expression+ augassign (&&(','.expression+)) | annotations
         mark = self._mark()
         if (
             (a := self.annotations())
             and
             (literal := self.expect('='))
             and
-            (forced := self.expect_forced(self._gather_8(), '''(','.expression+)'''))
+            (v := self.expect_forced(self._gather_9(), '''(','.expression+)'''))
         ):
             return kiwi . AnnAssignment ( a [0] [0] . start , v [- 1] . end , * a , v )
         self._reset(mark)
         if (
-            (i := self._gather_10())
+            (i := self._gather_11())
             and
             (literal := self.expect('='))
             and
-            (forced := self.expect_forced(self._gather_12(), '''(','.expression+)'''))
+            (v := self.expect_forced(self._gather_13(), '''(','.expression+)'''))
         ):
             return kiwi . Assignment ( i [0] . start , v [- 1] . end , i , v )
         self._reset(mark)
         if (
-            (i := self._gather_14())
+            (i := self._gather_15())
             and
             (o := self.augassign())
             and
-            (forced := self.expect_forced(self._gather_16(), '''(','.expression+)'''))
+            (v := self.expect_forced(self._gather_17(), '''(','.expression+)'''))
         ):
             return kiwi . AugAssignment ( i [0] . start , v [- 1] . end , i , o , v )
         self._reset(mark)
@@ -329,23 +391,23 @@ class KiwiParser(Parser):
 
     @memoize
     def annotations(self) -> Optional[Any]:
-        # annotations: expression ':' &&(expression+) | ','.expression+ '->' &&(expression+)
+        # annotations: expression ':' (&&(expression+)) | ','.expression+ '->' (&&(expression+))
         mark = self._mark()
         if (
             (i := self.expression())
             and
             (literal := self.expect(':'))
             and
-            (forced := self.expect_forced(self._loop1_18(), '''(expression+)'''))
+            (a := self.expect_forced(self._loop1_19(), '''(expression+)'''))
         ):
             return [i] , a [0] , a [1 :]
         self._reset(mark)
         if (
-            (i := self._gather_19())
+            (i := self._gather_20())
             and
             (literal := self.expect('->'))
             and
-            (forced := self.expect_forced(self._loop1_21(), '''(expression+)'''))
+            (a := self.expect_forced(self._loop1_22(), '''(expression+)'''))
         ):
             return i , a [0] , a [1 :]
         self._reset(mark)
@@ -448,20 +510,22 @@ class KiwiParser(Parser):
         # blocks: ((private_block | public_block | default_block))+
         mark = self._mark()
         if (
-            (_loop1_22 := self._loop1_22())
+            (_loop1_23 := self._loop1_23())
         ):
-            return _loop1_22
+            return _loop1_23
         self._reset(mark)
         return None
 
     @memoize
     def private_block(self) -> Optional[Any]:
-        # private_block: 'private' &&(':' block)
+        # private_block: 'private' &&':' (&&(block))
         mark = self._mark()
         if (
             (s := self.expect('private'))
             and
-            (forced := self.expect_forced(self._tmp_23(), '''(':' block)'''))
+            (forced := self.expect_forced(self.expect(':'), "':'"))
+            and
+            (v := self.expect_forced(self.block(), '''(block)'''))
         ):
             return kiwi . PrivateBlock ( s . start , v [- 1] . end , v )
         self._reset(mark)
@@ -469,12 +533,14 @@ class KiwiParser(Parser):
 
     @memoize
     def public_block(self) -> Optional[Any]:
-        # public_block: 'public' &&(':' block)
+        # public_block: 'public' &&':' (&&(block))
         mark = self._mark()
         if (
             (s := self.expect('public'))
             and
-            (forced := self.expect_forced(self._tmp_24(), '''(':' block)'''))
+            (forced := self.expect_forced(self.expect(':'), "':'"))
+            and
+            (v := self.expect_forced(self.block(), '''(block)'''))
         ):
             return kiwi . PublicBlock ( s . start , v [- 1] . end , v )
         self._reset(mark)
@@ -493,14 +559,16 @@ class KiwiParser(Parser):
 
     @memoize
     def namespace_def(self) -> Optional[Any]:
-        # namespace_def: 'namespace' &&(NAME_) &&(':' hiding_block)
+        # namespace_def: 'namespace' (&&(NAME_)) &&':' (&&(hiding_block))
         mark = self._mark()
         if (
             (s := self.expect('namespace'))
             and
-            (forced := self.expect_forced(self.NAME_(), '''(NAME_)'''))
+            (i := self.expect_forced(self.NAME_(), '''(NAME_)'''))
             and
-            (forced_1 := self.expect_forced(self._tmp_25(), '''(':' hiding_block)'''))
+            (forced := self.expect_forced(self.expect(':'), "':'"))
+            and
+            (b := self.expect_forced(self.hiding_block(), '''(hiding_block)'''))
         ):
             return kiwi . NamespaceDef ( s . start , b [- 1] . end , i , b )
         self._reset(mark)
@@ -606,9 +674,9 @@ class KiwiParser(Parser):
         # nullable=True
         mark = self._mark()
         if (
-            (p := self._loop0_26(),)
+            (p := self._loop0_24(),)
             and
-            (d := self._loop0_27(),)
+            (d := self._loop0_25(),)
         ):
             return [* p , * map ( lambda x : x [0] , d )] , list ( map ( lambda x : x [1] , d ) )
         self._reset(mark)
@@ -713,7 +781,7 @@ class KiwiParser(Parser):
         if (
             (s := self.expression())
             and
-            (a := self._loop0_28(),)
+            (a := self._loop0_26(),)
         ):
             return kiwi . ReturnParameter ( s . start , a [- 1] . end if a else s . end , s , a )
         self._reset(mark)
@@ -832,7 +900,7 @@ class KiwiParser(Parser):
             and
             (p := self.expression())
             and
-            (a := self._loop1_29())
+            (a := self._loop1_27())
         ):
             return [t] , p , a
         self._reset(mark)
@@ -905,9 +973,9 @@ class KiwiParser(Parser):
         # cases: (',' NEWLINE*).case+
         mark = self._mark()
         if (
-            (_gather_30 := self._gather_30())
+            (_gather_28 := self._gather_28())
         ):
-            return _gather_30
+            return _gather_28
         self._reset(mark)
         return None
 
@@ -980,7 +1048,7 @@ class KiwiParser(Parser):
         # nullable=True
         mark = self._mark()
         if (
-            (v := self._gather_32())
+            (v := self._gather_30())
         ):
             return v
         self._reset(mark)
@@ -1009,7 +1077,7 @@ class KiwiParser(Parser):
         if (
             (s := self.conjunctions())
             and
-            (a := self._loop1_34())
+            (a := self._loop1_32())
         ):
             return kiwi . Disjunctions ( s . start , a [- 1] . end , [s , * a] )
         self._reset(mark)
@@ -1040,7 +1108,7 @@ class KiwiParser(Parser):
         if (
             (s := self.inversion())
             and
-            (a := self._loop1_35())
+            (a := self._loop1_33())
         ):
             return kiwi . Conjunctions ( s . start , a [- 1] . end , [s , * a] )
         self._reset(mark)
@@ -1089,7 +1157,7 @@ class KiwiParser(Parser):
         if (
             (f := self.range())
             and
-            (v := self._loop1_36())
+            (v := self._loop1_34())
         ):
             return kiwi . Comparisons ( f . start , v [- 1] [1] . end , [f , * list ( map ( lambda x : x [1] , v ) )] , list ( map ( lambda x : x [0] , v ) ) )
         self._reset(mark)
@@ -1485,7 +1553,7 @@ class KiwiParser(Parser):
         # args: ','.expression+
         mark = self._mark()
         if (
-            (v := self._gather_37())
+            (v := self._gather_35())
         ):
             return v
         self._reset(mark)
@@ -1515,9 +1583,9 @@ class KiwiParser(Parser):
         # match_keys: (',' NEWLINE*).match_key+
         mark = self._mark()
         if (
-            (_gather_39 := self._gather_39())
+            (_gather_37 := self._gather_37())
         ):
-            return _gather_39
+            return _gather_37
         self._reset(mark)
         return None
 
@@ -1585,7 +1653,7 @@ class KiwiParser(Parser):
         # WORD_: ((NUMBER | NAME))+
         mark = self._mark()
         if (
-            (v := self._loop1_41())
+            (v := self._loop1_39())
         ):
             return kiwi . Word ( v [0] . start , v [- 1] . end , '' . join ( list ( map ( str , v ) ) ) )
         self._reset(mark)
@@ -1720,9 +1788,9 @@ class KiwiParser(Parser):
         mark = self._mark()
         children = []
         while (
-            (_tmp_42 := self._tmp_42())
+            (_tmp_40 := self._tmp_40())
         ):
-            children.append(_tmp_42)
+            children.append(_tmp_40)
             mark = self._mark()
         self._reset(mark)
         return children
@@ -1733,9 +1801,9 @@ class KiwiParser(Parser):
         mark = self._mark()
         children = []
         while (
-            (_tmp_43 := self._tmp_43())
+            (_tmp_41 := self._tmp_41())
         ):
-            children.append(_tmp_43)
+            children.append(_tmp_41)
             mark = self._mark()
         self._reset(mark)
         return children
@@ -1785,20 +1853,33 @@ class KiwiParser(Parser):
 
     @memoize
     def _loop1_6(self) -> Optional[Any]:
-        # _loop1_6: (NEWLINE | ';')
+        # _loop1_6: module_statement
         mark = self._mark()
         children = []
         while (
-            (_tmp_44 := self._tmp_44())
+            (module_statement := self.module_statement())
         ):
-            children.append(_tmp_44)
+            children.append(module_statement)
             mark = self._mark()
         self._reset(mark)
         return children
 
     @memoize
     def _loop1_7(self) -> Optional[Any]:
-        # _loop1_7: (NEWLINE)
+        # _loop1_7: (NEWLINE | ';')
+        mark = self._mark()
+        children = []
+        while (
+            (_tmp_42 := self._tmp_42())
+        ):
+            children.append(_tmp_42)
+            mark = self._mark()
+        self._reset(mark)
+        return children
+
+    @memoize
+    def _loop1_8(self) -> Optional[Any]:
+        # _loop1_8: (NEWLINE)
         mark = self._mark()
         children = []
         while (
@@ -1810,8 +1891,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_9(self) -> Optional[Any]:
-        # _loop0_9: ',' expression
+    def _loop0_10(self) -> Optional[Any]:
+        # _loop0_10: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1825,14 +1906,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_8(self) -> Optional[Any]:
-        # _gather_8: expression _loop0_9
+    def _gather_9(self) -> Optional[Any]:
+        # _gather_9: expression _loop0_10
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_9())
+            (seq := self._loop0_10())
             is not None
         ):
             return [elem] + seq
@@ -1840,8 +1921,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_11(self) -> Optional[Any]:
-        # _loop0_11: ',' expression
+    def _loop0_12(self) -> Optional[Any]:
+        # _loop0_12: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1855,14 +1936,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_10(self) -> Optional[Any]:
-        # _gather_10: expression _loop0_11
+    def _gather_11(self) -> Optional[Any]:
+        # _gather_11: expression _loop0_12
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_11())
+            (seq := self._loop0_12())
             is not None
         ):
             return [elem] + seq
@@ -1870,8 +1951,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_13(self) -> Optional[Any]:
-        # _loop0_13: ',' expression
+    def _loop0_14(self) -> Optional[Any]:
+        # _loop0_14: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1885,14 +1966,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_12(self) -> Optional[Any]:
-        # _gather_12: expression _loop0_13
+    def _gather_13(self) -> Optional[Any]:
+        # _gather_13: expression _loop0_14
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_13())
+            (seq := self._loop0_14())
             is not None
         ):
             return [elem] + seq
@@ -1900,8 +1981,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_15(self) -> Optional[Any]:
-        # _loop0_15: ',' expression
+    def _loop0_16(self) -> Optional[Any]:
+        # _loop0_16: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1915,14 +1996,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_14(self) -> Optional[Any]:
-        # _gather_14: expression _loop0_15
+    def _gather_15(self) -> Optional[Any]:
+        # _gather_15: expression _loop0_16
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_15())
+            (seq := self._loop0_16())
             is not None
         ):
             return [elem] + seq
@@ -1930,8 +2011,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_17(self) -> Optional[Any]:
-        # _loop0_17: ',' expression
+    def _loop0_18(self) -> Optional[Any]:
+        # _loop0_18: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1945,14 +2026,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_16(self) -> Optional[Any]:
-        # _gather_16: expression _loop0_17
+    def _gather_17(self) -> Optional[Any]:
+        # _gather_17: expression _loop0_18
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_17())
+            (seq := self._loop0_18())
             is not None
         ):
             return [elem] + seq
@@ -1960,8 +2041,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop1_18(self) -> Optional[Any]:
-        # _loop1_18: expression
+    def _loop1_19(self) -> Optional[Any]:
+        # _loop1_19: expression
         mark = self._mark()
         children = []
         while (
@@ -1973,8 +2054,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_20(self) -> Optional[Any]:
-        # _loop0_20: ',' expression
+    def _loop0_21(self) -> Optional[Any]:
+        # _loop0_21: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -1988,14 +2069,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_19(self) -> Optional[Any]:
-        # _gather_19: expression _loop0_20
+    def _gather_20(self) -> Optional[Any]:
+        # _gather_20: expression _loop0_21
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_20())
+            (seq := self._loop0_21())
             is not None
         ):
             return [elem] + seq
@@ -2003,8 +2084,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop1_21(self) -> Optional[Any]:
-        # _loop1_21: expression
+    def _loop1_22(self) -> Optional[Any]:
+        # _loop1_22: expression
         mark = self._mark()
         children = []
         while (
@@ -2016,60 +2097,21 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop1_22(self) -> Optional[Any]:
-        # _loop1_22: (private_block | public_block | default_block)
+    def _loop1_23(self) -> Optional[Any]:
+        # _loop1_23: (private_block | public_block | default_block)
         mark = self._mark()
         children = []
         while (
-            (_tmp_45 := self._tmp_45())
+            (_tmp_43 := self._tmp_43())
         ):
-            children.append(_tmp_45)
+            children.append(_tmp_43)
             mark = self._mark()
         self._reset(mark)
         return children
 
     @memoize
-    def _tmp_23(self) -> Optional[Any]:
-        # _tmp_23: ':' block
-        mark = self._mark()
-        if (
-            (literal := self.expect(':'))
-            and
-            (v := self.block())
-        ):
-            return [literal, v]
-        self._reset(mark)
-        return None
-
-    @memoize
-    def _tmp_24(self) -> Optional[Any]:
-        # _tmp_24: ':' block
-        mark = self._mark()
-        if (
-            (literal := self.expect(':'))
-            and
-            (v := self.block())
-        ):
-            return [literal, v]
-        self._reset(mark)
-        return None
-
-    @memoize
-    def _tmp_25(self) -> Optional[Any]:
-        # _tmp_25: ':' hiding_block
-        mark = self._mark()
-        if (
-            (literal := self.expect(':'))
-            and
-            (b := self.hiding_block())
-        ):
-            return [literal, b]
-        self._reset(mark)
-        return None
-
-    @memoize
-    def _loop0_26(self) -> Optional[Any]:
-        # _loop0_26: param_no_default
+    def _loop0_24(self) -> Optional[Any]:
+        # _loop0_24: param_no_default
         mark = self._mark()
         children = []
         while (
@@ -2081,8 +2123,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_27(self) -> Optional[Any]:
-        # _loop0_27: param_with_default
+    def _loop0_25(self) -> Optional[Any]:
+        # _loop0_25: param_with_default
         mark = self._mark()
         children = []
         while (
@@ -2094,8 +2136,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_28(self) -> Optional[Any]:
-        # _loop0_28: expression
+    def _loop0_26(self) -> Optional[Any]:
+        # _loop0_26: expression
         mark = self._mark()
         children = []
         while (
@@ -2107,8 +2149,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop1_29(self) -> Optional[Any]:
-        # _loop1_29: expression
+    def _loop1_27(self) -> Optional[Any]:
+        # _loop1_27: expression
         mark = self._mark()
         children = []
         while (
@@ -2120,12 +2162,12 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_31(self) -> Optional[Any]:
-        # _loop0_31: (',' NEWLINE*) case
+    def _loop0_29(self) -> Optional[Any]:
+        # _loop0_29: (',' NEWLINE*) case
         mark = self._mark()
         children = []
         while (
-            (_tmp_46 := self._tmp_46())
+            (_tmp_44 := self._tmp_44())
             and
             (elem := self.case())
         ):
@@ -2135,14 +2177,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_30(self) -> Optional[Any]:
-        # _gather_30: case _loop0_31
+    def _gather_28(self) -> Optional[Any]:
+        # _gather_28: case _loop0_29
         mark = self._mark()
         if (
             (elem := self.case())
             is not None
             and
-            (seq := self._loop0_31())
+            (seq := self._loop0_29())
             is not None
         ):
             return [elem] + seq
@@ -2150,8 +2192,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_33(self) -> Optional[Any]:
-        # _loop0_33: ',' lambda_param
+    def _loop0_31(self) -> Optional[Any]:
+        # _loop0_31: ',' lambda_param
         mark = self._mark()
         children = []
         while (
@@ -2165,14 +2207,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_32(self) -> Optional[Any]:
-        # _gather_32: lambda_param _loop0_33
+    def _gather_30(self) -> Optional[Any]:
+        # _gather_30: lambda_param _loop0_31
         mark = self._mark()
         if (
             (elem := self.lambda_param())
             is not None
             and
-            (seq := self._loop0_33())
+            (seq := self._loop0_31())
             is not None
         ):
             return [elem] + seq
@@ -2180,8 +2222,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop1_34(self) -> Optional[Any]:
-        # _loop1_34: disjunction
+    def _loop1_32(self) -> Optional[Any]:
+        # _loop1_32: disjunction
         mark = self._mark()
         children = []
         while (
@@ -2193,8 +2235,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop1_35(self) -> Optional[Any]:
-        # _loop1_35: conjunction
+    def _loop1_33(self) -> Optional[Any]:
+        # _loop1_33: conjunction
         mark = self._mark()
         children = []
         while (
@@ -2206,8 +2248,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop1_36(self) -> Optional[Any]:
-        # _loop1_36: compare_op_sum_pair
+    def _loop1_34(self) -> Optional[Any]:
+        # _loop1_34: compare_op_sum_pair
         mark = self._mark()
         children = []
         while (
@@ -2219,8 +2261,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_38(self) -> Optional[Any]:
-        # _loop0_38: ',' expression
+    def _loop0_36(self) -> Optional[Any]:
+        # _loop0_36: ',' expression
         mark = self._mark()
         children = []
         while (
@@ -2234,14 +2276,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_37(self) -> Optional[Any]:
-        # _gather_37: expression _loop0_38
+    def _gather_35(self) -> Optional[Any]:
+        # _gather_35: expression _loop0_36
         mark = self._mark()
         if (
             (elem := self.expression())
             is not None
             and
-            (seq := self._loop0_38())
+            (seq := self._loop0_36())
             is not None
         ):
             return [elem] + seq
@@ -2249,12 +2291,12 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_40(self) -> Optional[Any]:
-        # _loop0_40: (',' NEWLINE*) match_key
+    def _loop0_38(self) -> Optional[Any]:
+        # _loop0_38: (',' NEWLINE*) match_key
         mark = self._mark()
         children = []
         while (
-            (_tmp_47 := self._tmp_47())
+            (_tmp_45 := self._tmp_45())
             and
             (elem := self.match_key())
         ):
@@ -2264,14 +2306,14 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _gather_39(self) -> Optional[Any]:
-        # _gather_39: match_key _loop0_40
+    def _gather_37(self) -> Optional[Any]:
+        # _gather_37: match_key _loop0_38
         mark = self._mark()
         if (
             (elem := self.match_key())
             is not None
             and
-            (seq := self._loop0_40())
+            (seq := self._loop0_38())
             is not None
         ):
             return [elem] + seq
@@ -2279,21 +2321,21 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop1_41(self) -> Optional[Any]:
-        # _loop1_41: (NUMBER | NAME)
+    def _loop1_39(self) -> Optional[Any]:
+        # _loop1_39: (NUMBER | NAME)
         mark = self._mark()
         children = []
         while (
-            (_tmp_48 := self._tmp_48())
+            (_tmp_46 := self._tmp_46())
         ):
-            children.append(_tmp_48)
+            children.append(_tmp_46)
             mark = self._mark()
         self._reset(mark)
         return children
 
     @memoize
-    def _tmp_42(self) -> Optional[Any]:
-        # _tmp_42: import_stmt | from_import_stmt
+    def _tmp_40(self) -> Optional[Any]:
+        # _tmp_40: import_stmt | from_import_stmt
         mark = self._mark()
         if (
             (import_stmt := self.import_stmt())
@@ -2308,8 +2350,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _tmp_43(self) -> Optional[Any]:
-        # _tmp_43: NEWLINE | ';'
+    def _tmp_41(self) -> Optional[Any]:
+        # _tmp_41: NEWLINE | ';'
         mark = self._mark()
         if (
             (_newline := self.expect('NEWLINE'))
@@ -2324,8 +2366,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _tmp_44(self) -> Optional[Any]:
-        # _tmp_44: NEWLINE | ';'
+    def _tmp_42(self) -> Optional[Any]:
+        # _tmp_42: NEWLINE | ';'
         mark = self._mark()
         if (
             (_newline := self.expect('NEWLINE'))
@@ -2340,8 +2382,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _tmp_45(self) -> Optional[Any]:
-        # _tmp_45: private_block | public_block | default_block
+    def _tmp_43(self) -> Optional[Any]:
+        # _tmp_43: private_block | public_block | default_block
         mark = self._mark()
         if (
             (private_block := self.private_block())
@@ -2361,34 +2403,34 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _tmp_46(self) -> Optional[Any]:
-        # _tmp_46: ',' NEWLINE*
+    def _tmp_44(self) -> Optional[Any]:
+        # _tmp_44: ',' NEWLINE*
         mark = self._mark()
         if (
             (literal := self.expect(','))
             and
-            (_loop0_49 := self._loop0_49(),)
+            (_loop0_47 := self._loop0_47(),)
         ):
-            return [literal, _loop0_49]
+            return [literal, _loop0_47]
         self._reset(mark)
         return None
 
     @memoize
-    def _tmp_47(self) -> Optional[Any]:
-        # _tmp_47: ',' NEWLINE*
+    def _tmp_45(self) -> Optional[Any]:
+        # _tmp_45: ',' NEWLINE*
         mark = self._mark()
         if (
             (literal := self.expect(','))
             and
-            (_loop0_50 := self._loop0_50(),)
+            (_loop0_48 := self._loop0_48(),)
         ):
-            return [literal, _loop0_50]
+            return [literal, _loop0_48]
         self._reset(mark)
         return None
 
     @memoize
-    def _tmp_48(self) -> Optional[Any]:
-        # _tmp_48: NUMBER | NAME
+    def _tmp_46(self) -> Optional[Any]:
+        # _tmp_46: NUMBER | NAME
         mark = self._mark()
         if (
             (number := self.number())
@@ -2403,8 +2445,8 @@ class KiwiParser(Parser):
         return None
 
     @memoize
-    def _loop0_49(self) -> Optional[Any]:
-        # _loop0_49: NEWLINE
+    def _loop0_47(self) -> Optional[Any]:
+        # _loop0_47: NEWLINE
         mark = self._mark()
         children = []
         while (
@@ -2416,8 +2458,8 @@ class KiwiParser(Parser):
         return children
 
     @memoize
-    def _loop0_50(self) -> Optional[Any]:
-        # _loop0_50: NEWLINE
+    def _loop0_48(self) -> Optional[Any]:
+        # _loop0_48: NEWLINE
         mark = self._mark()
         children = []
         while (
@@ -2,6 +2,11 @@
 This module represents the first step of compiler frontend.
 It creates a lexical (or tokenizer) tokens, that can be used by the second step of frontend (parser).
 Basically, the tokenizer is Python tokenizer post processor.
+
+Usually, tokens are produced by Kiwi lexer in one pass into array-backed buffer of pegen tokenizer.
+If the source has constructions, which are not supported by the lexer
+(for example multi-line strings or backslash continuations),
+the chain of Python tokenizer and post processors is used instead.
 """
 
 from __future__ import annotations
@@ -9,9 +14,12 @@ from __future__ import annotations
 # Default libraries
 # -----------------
 
-from tokenize import TokenInfo, NEWLINE, NL, DEDENT, COMMENT, generate_tokens
+from tokenize import TokenInfo, NEWLINE, NL, DEDENT, INDENT, COMMENT, ENDMARKER, NUMBER, STRING, NAME, OP, \
+    ERRORTOKEN, PseudoToken, endpats, single_quoted, triple_quoted, tabsize, generate_tokens
 from io import StringIO
-from typing import Iterator
+from typing import Iterator, List, Dict, Tuple, Optional
+import re
+import gc
 
 # Custom libraries
 # ----------------
@@ -25,13 +33,31 @@ class Tokenizer:
 
     def __init__(self, text: str):
         self.text = text
-        self.lexer = PegenTokenizer(
-            Tokenize(
-                Ignores(
-                    generate_tokens(StringIO(text).readline)
+        try:
+            tokens, lines = lex(text)
+        except UnsupportedSource:
+            self.lexer = PegenTokenizer(
+                Tokenize(
+                    Ignores(
+                        generate_tokens(StringIO(text).readline)
+                    )
                 )
             )
-        )
+            return
+        self.lexer = PegenTokenizer(iter(()))
+        self.lexer._tokens = tokens
+        self.lexer._lines = lines
+
+    def tokenize(self):
+        """
+        Reads all tokens at once, so the parser takes them from the lexer cache.
+        It's used to measure tokenizer apart from parser.
+        """
+        if self.lexer._tokens and self.lexer._tokens[-1].type == ENDMARKER:
+            return
+        while self.lexer.getnext().type != ENDMARKER:
+            pass
+        self.lexer.reset(0)
 
 
 def Ignores(stream: Iterator[TokenInfo]) -> Iterator[TokenInfo]:
@@ -65,3 +91,194 @@ def Tokenize(stream: Iterator[TokenInfo]):
             yield y
         else:
             yield x
+
+
+# Kiwi lexer
+# ----------
+
+class UnsupportedSource(Exception):
+    """
+    The source can't be tokenized by Kiwi lexer, so Python tokenizer is used.
+    """
+
+
+_pseudo = re.compile(PseudoToken, re.UNICODE)
+_endPatterns: Dict[str, re.Pattern] = {key: re.compile(value, re.UNICODE)
+                                       for key, value in endpats.items() if value is not None}
+_numbers = '0123456789'
+
+
+def lex(text: str) -> Tuple[List[TokenInfo], Dict[int, str]]:
+    """
+    Returns tokens and source lines in the form of pegen tokenizer cache.
+    It repeats Python tokenizer, Ignores, Tokenize and filters of pegen tokenizer in one pass:
+    comments and non-logical newlines are dropped, dedent tokens are surrounded by newline tokens,
+    and repeated newline tokens are skipped.
+    """
+    # Tokens are never cyclic, but garbage collector scans them again and again while buffer grows
+    paused = gc.isenabled()
+    gc.disable()
+    try:
+        return _lex(text)
+    finally:
+        if paused:
+            gc.enable()
+
+
+def _lex(text: str) -> Tuple[List[TokenInfo], Dict[int, str]]:
+    tokens: List[TokenInfo] = list()
+    lines: Dict[int, str] = dict()
+    append = tokens.append
+    pseudo = _pseudo.match
+    new = tuple.__new__
+
+    # The last newline token, which is waiting for the next token (see Tokenize),
+    # it's False, if the last newline token is non-logical.
+    waiting: Optional[TokenInfo | bool] = None
+    dedenting = False
+
+    def emit(token: TokenInfo):
+        if token.type == ERRORTOKEN and token.string.isspace():
+            return
+        if token.type == NEWLINE and tokens and tokens[-1].type == NEWLINE:
+            return
+        append(token)
+        lines[token.start[0]] = token.line
+
+    def push(token: TokenInfo):
+        nonlocal waiting, dedenting
+        if waiting is None:
+            if token.type == NEWLINE:
+                waiting, dedenting = token, False
+                return
+            emit(token)
+            return
+        if token.type == DEDENT:
+            if waiting:
+                emit(waiting)
+                emit(token)
+                emit(waiting)
+            else:
+                emit(token)
+            dedenting = True
+            return
+        if waiting and not dedenting:
+            emit(waiting)
+        emit(token)
+        waiting = None
+
+    def pushBreak():
+        """
+        Non-logical newline, it's never emitted, but it can start a group of Tokenize.
+        """
+        nonlocal waiting, dedenting
+        if waiting is None:
+            waiting, dedenting = False, False
+        elif dedenting:
+            waiting = None
+
+    source = text.split('\n')
+    physical = [line + '\n' for line in source[:-1]]
+    if source[-1]:
+        physical.append(source[-1])
+    physical.append('')
+
+    indents = [0]
+    parenlev = 0
+    lnum = 0
+    lastLine = ''
+    for line in physical:
+        lnum += 1
+        pos, end = 0, len(line)
+
+        if parenlev == 0:
+            if not line:
+                break
+            column = 0
+            while pos < end:
+                char = line[pos]
+                if char == ' ':
+                    column += 1
+                elif char == '\t':
+                    column = (column // tabsize + 1) * tabsize
+                elif char == '\f':
+                    column = 0
+                else:
+                    break
+                pos += 1
+            if pos == end:
+                # Python tokenizer stops at the last line, which has only whitespaces
+                break
+
+            if line[pos] in '#\r\n':
+                pushBreak()
+                lastLine = line
+                continue
+
+            if column > indents[-1]:
+                indents.append(column)
+                push(TokenInfo(INDENT, line[:pos], (lnum, 0), (lnum, pos), line))
+            while column < indents[-1]:
+                if column not in indents:
+                    raise UnsupportedSource('unindent does not match any outer indentation level')
+                indents.pop()
+                push(TokenInfo(DEDENT, '', (lnum, pos), (lnum, pos), line))
+        elif not line:
+            raise UnsupportedSource('EOF in multi-line statement')
+
+        while pos < end:
+            match = pseudo(line, pos)
+            if match is None:
+                push(new(TokenInfo, (ERRORTOKEN, line[pos], (lnum, pos), (lnum, pos + 1), line)))
+                pos += 1
+                continue
+            start, pos = match.span(1)
+            if start == pos:
+                continue
+            token, initial = line[start:pos], line[start]
+
+            if initial in _numbers or (initial == '.' and token != '.' and token != '...'):
+                kind = NUMBER
+            elif initial in '\r\n':
+                if parenlev > 0:
+                    pushBreak()
+                else:
+                    push(new(TokenInfo, (NEWLINE, token, (lnum, start), (lnum, pos), line)))
+                continue
+            elif initial == '#':
+                continue
+            elif token in triple_quoted:
+                if (closing := _endPatterns[token].match(line, pos)) is None:
+                    raise UnsupportedSource('multi-line string')
+                pos = closing.end(0)
+                token, kind = line[start:pos], STRING
+            elif initial in single_quoted or token[:2] in single_quoted or token[:3] in single_quoted:
+                if token[-1] == '\n':
+                    raise UnsupportedSource('multi-line string')
+                kind = STRING
+            elif initial.isidentifier():
+                kind = NAME
+            elif initial == '\\':
+                raise UnsupportedSource('backslash continuation')
+            else:
+                if initial in '([{':
+                    parenlev += 1
+                elif initial in ')]}':
+                    parenlev -= 1
+                kind = OP
+
+            if waiting is None:
+                # The most tokens are just appended, so push isn't called for them
+                append(new(TokenInfo, (kind, token, (lnum, start), (lnum, pos), line)))
+                lines[lnum] = line
+            else:
+                push(new(TokenInfo, (kind, token, (lnum, start), (lnum, pos), line)))
+        lastLine = line
+
+    # The last line of source without line break gets newline token
+    if lastLine and lastLine[-1] not in '\r\n' and not lastLine.strip().startswith('#'):
+        push(TokenInfo(NEWLINE, '', (lnum - 1, len(lastLine)), (lnum - 1, len(lastLine) + 1), ''))
+    for _ in indents[1:]:
+        push(TokenInfo(DEDENT, '', (lnum, 0), (lnum, 0), ''))
+    push(TokenInfo(ENDMARKER, '', (lnum, 0), (lnum, 0), ''))
+    return tokens, lines